@@ -1,10 +1,22 @@
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import pandas as pd
 import numpy as np
-import json
+import os
+
+import timing
+from shared_cache import cache as shared_cache
+from catalog import CatalogError, list_catalogs, load_catalog
+from cohorts import project_schedule, repeat_schedule
+from growth import MAX_HORIZON
+from optimizer import optimize_mix, pareto_frontier
+from projection import IncrementalProjection, normalize_plan, plan_key
+from regions import DEFAULT_REGIONS, load_regions, project_regions
+from sensitivity import LABELS as SENSITIVITY_LABELS, PARAMETERS as SENSITIVITY_PARAMETERS, sweep
+from simulation import simulate_survival
+
+# pandas and plotly (via charts and export) take most of the import time, so they
+# are imported inside the sections that use them, after the empty-selection
+# return: the title and sidebar paint before they load, and a run without a
+# selection never loads them.
 
 
 st.set_page_config(
@@ -15,300 +27,641 @@ st.set_page_config(
 )
 
 
-TREE_DATA = {
-    "Bargad (Banyan)": {
-      "Avg_Biomass_kg_per_year": 90,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.7,
-      "Lifespan_Years": 20,
-      "CO2_Sequestration_20yrs": [115.6,231.21,346.81,462.42,578.02,693.63,809.23,924.84,1040.44,1156.05,1271.65,1387.26,1502.86,1618.47,1734.07,1849.68,1965.28,2080.89,2196.49,2312.1]
-    },
-    "Gulmohar": {
-      "Avg_Biomass_kg_per_year": 45,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.8,
-      "Lifespan_Years": 20,
-      "CO2_Sequestration_20yrs": [66.06,132.12,198.18,264.24,330.3,396.36,462.42,528.48,594.54,660.6,726.66,792.72,858.78,924.84,990.9,1056.96,1123.02,1189.08,1255.14,1321.2]
-    },
-    "Neem": {
-      "Avg_Biomass_kg_per_year": 60,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.85,
-      "Lifespan_Years": 30,
-      "CO2_Sequestration_20yrs": [93.58,187.17,280.75,374.34,467.92,561.51,655.09,748.68,842.26,935.85,1029.43,1123.02,1216.61,1310.19,1403.77,1497.36,1590.94,1684.53,1778.11,1871.7]
-    },
-    "Peepal": {
-      "Avg_Biomass_kg_per_year": 80,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.75,
-      "Lifespan_Years": 25,
-      "CO2_Sequestration_20yrs": [110.1,220.2,330.3,440.4,550.5,660.6,770.7,880.8,990.9,1101.0,1211.1,1321.2,1431.3,1541.4,1651.5,1761.6,1871.7,1981.8,2091.9,2202.0]
-    },
-    "Mango": {
-      "Avg_Biomass_kg_per_year": 55,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.8,
-      "Lifespan_Years": 30,
-      "CO2_Sequestration_20yrs": [80.74,161.48,242.22,322.96,403.7,484.44,565.18,645.92,726.66,807.4,888.14,968.88,1049.62,1130.36,1211.1,1291.84,1372.58,1453.32,1534.06,1614.8]
-    },
-    "Teak": {
-      "Avg_Biomass_kg_per_year": 70,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.7,
-      "Lifespan_Years": 50,
-      "CO2_Sequestration_20yrs": [89.91,179.83,269.75,359.66,449.57,539.49,629.4,719.32,809.23,899.15,989.06,1078.98,1168.89,1258.81,1348.72,1438.64,1528.55,1618.47,1708.38,1798.3]
-    },
-    "Jamun": {
-      "Avg_Biomass_kg_per_year": 50,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.75,
-      "Lifespan_Years": 30,
-      "CO2_Sequestration_20yrs": [68.81,137.62,206.44,275.25,344.06,412.88,481.69,550.5,619.31,688.12,756.94,825.75,894.56,963.38,1032.19,1101.0,1169.81,1238.62,1307.44,1376.25]
-    },
-    "Arjun": {
-      "Avg_Biomass_kg_per_year": 65,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.7,
-      "Lifespan_Years": 40,
-      "CO2_Sequestration_20yrs": [83.49,166.98,250.48,333.97,417.46,500.95,584.45,667.94,751.43,834.92,918.42,1001.91,1085.4,1168.89,1252.39,1335.88,1419.37,1502.86,1586.36,1669.85]
-    },
-    "Sal": {
-      "Avg_Biomass_kg_per_year": 75,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.65,
-      "Lifespan_Years": 50,
-      "CO2_Sequestration_20yrs": [89.46,178.91,268.37,357.82,447.28,536.74,626.19,715.65,805.11,894.56,984.02,1073.47,1162.93,1252.39,1341.84,1431.3,1520.76,1610.21,1699.67,1789.12]
-    },
-    "Shisham (Sissoo)": {
-      "Avg_Biomass_kg_per_year": 60,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.7,
-      "Lifespan_Years": 35,
-      "CO2_Sequestration_20yrs": [77.07,154.14,231.21,308.28,385.35,462.42,539.49,616.56,693.63,770.7,847.77,924.84,1001.91,1078.98,1156.05,1233.12,1310.19,1387.26,1464.33,1541.4]
-    },
-    "Kadam": {
-      "Avg_Biomass_kg_per_year": 55,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.75,
-      "Lifespan_Years": 30,
-      "CO2_Sequestration_20yrs": [75.69,151.39,227.08,302.77,378.47,454.16,529.86,605.55,681.24,756.94,832.63,908.32,984.02,1059.71,1135.41,1211.1,1286.79,1362.49,1438.18,1513.88]
-    },
-    "Mahua": {
-      "Avg_Biomass_kg_per_year": 45,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.65,
-      "Lifespan_Years": 30,
-      "CO2_Sequestration_20yrs": [53.67,107.35,161.02,214.7,268.37,322.04,375.72,429.39,483.06,536.74,590.41,644.09,697.76,751.43,805.11,858.78,912.45,966.13,1019.8,1073.48]
-    },
-    "Tecoma (Yellow Bell)": {
-      "Avg_Biomass_kg_per_year": 40,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.8,
-      "Lifespan_Years": 25,
-      "CO2_Sequestration_20yrs": [58.72,117.44,176.16,234.88,293.6,352.32,411.04,469.76,528.48,587.2,645.92,704.64,763.36,822.08,880.8,939.52,998.24,1056.96,1115.68,1174.4]
-    },
-    "Casuarina": {
-      "Avg_Biomass_kg_per_year": 65,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.75,
-      "Lifespan_Years": 30,
-      "CO2_Sequestration_20yrs": [89.46,178.91,268.37,357.82,447.28,536.74,626.19,715.65,805.11,894.56,984.02,1073.47,1162.93,1252.39,1341.84,1431.3,1520.76,1610.21,1699.67,1789.12]
-    },
-    "Coconut": {
-      "Avg_Biomass_kg_per_year": 70,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.85,
-      "Lifespan_Years": 60,
-      "CO2_Sequestration_20yrs": [109.18,218.36,327.55,436.73,545.91,655.09,764.28,873.46,982.64,1091.82,1201.01,1310.19,1419.37,1528.55,1637.74,1746.92,1856.1,1965.28,2074.47,2183.65]
-    },
-    "Kadamba": {
-      "Avg_Biomass_kg_per_year": 55,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.7,
-      "Lifespan_Years": 35,
-      "CO2_Sequestration_20yrs": [70.65,141.29,211.94,282.59,353.24,423.88,494.53,565.18,635.83,706.47,777.12,847.77,918.42,989.06,1059.71,1130.36,1201.01,1271.65,1342.3,1412.95]
-    },
-    "Babool (Acacia)": {
-      "Avg_Biomass_kg_per_year": 50,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.75,
-      "Lifespan_Years": 25,
-      "CO2_Sequestration_20yrs": [68.81,137.62,206.44,275.25,344.06,412.88,481.69,550.5,619.31,688.12,756.94,825.75,894.56,963.38,1032.19,1101.0,1169.81,1238.62,1307.44,1376.25]
-    },
-    "Indian Laburnum (Amaltas)": {
-      "Avg_Biomass_kg_per_year": 40,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.8,
-      "Lifespan_Years": 25,
-      "CO2_Sequestration_20yrs": [58.72,117.44,176.16,234.88,293.6,352.32,411.04,469.76,528.48,587.2,645.92,704.64,763.36,822.08,880.8,939.52,998.24,1056.96,1115.68,1174.4]
-    },
-    "Tamarind": {
-      "Avg_Biomass_kg_per_year": 60,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.75,
-      "Lifespan_Years": 50,
-      "CO2_Sequestration_20yrs": [82.57,165.15,247.72,330.3,412.87,495.45,578.02,660.6,743.17,825.75,908.32,990.9,1073.47,1156.05,1238.62,1321.2,1403.77,1486.35,1568.92,1651.5]
-    },
-    "Amla (Indian Gooseberry)": {
-      "Avg_Biomass_kg_per_year": 45,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.8,
-      "Lifespan_Years": 40,
-      "CO2_Sequestration_20yrs": [66.06,132.12,198.18,264.24,330.3,396.36,462.42,528.48,594.54,660.6,726.66,792.72,858.78,924.84,990.9,1056.96,1123.02,1189.08,1255.14,1321.2]
-    },
-    "Eucalyptus": {
-      "Avg_Biomass_kg_per_year": 85,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.65,
-      "Lifespan_Years": 25,
-      "CO2_Sequestration_20yrs": [101.38,202.77,304.15,405.54,506.92,608.3,709.69,811.07,912.45,1013.84,1115.22,1216.61,1317.99,1419.37,1520.76,1622.14,1723.52,1824.91,1926.29,2027.68]
-    },
-    "Pongamia (Karanja)": {
-      "Avg_Biomass_kg_per_year": 55,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.7,
-      "Lifespan_Years": 40,
-      "CO2_Sequestration_20yrs": [ 70.65,141.29,211.94,282.59,353.24,423.88,494.53,565.18,635.83,706.47,777.12,847.77,918.42,989.06,1059.71,1130.36,1201.01,1271.65,1342.3,1412.95]
-    },
-    "Jackfruit": {
-      "Avg_Biomass_kg_per_year": 75,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.7,
-      "Lifespan_Years": 50,
-      "CO2_Sequestration_20yrs": [96.34,192.67,289.01,385.35,481.69,578.02,674.36,770.7,867.04,963.37,1059.71,1156.05,1252.39,1348.72,1445.06,1541.4,1637.74,1734.07,1830.41,1926.75]
-    },
-    "Fig (Anjeer)": {
-      "Avg_Biomass_kg_per_year": 50,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.75,
-      "Lifespan_Years": 30,
-      "CO2_Sequestration_20yrs": [68.81,137.62,206.44,275.25,344.06,412.88,481.69,550.5,619.31,688.12,756.94,825.75,894.56,963.38,1032.19,1101.0,1169.81,1238.62,1307.44,1376.25]
-    },
-    "Palmyra Palm (Borassus)": {
-      "Avg_Biomass_kg_per_year": 65,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.7,
-      "Lifespan_Years": 60,
-      "CO2_Sequestration_20yrs": [83.49,166.98,250.48,333.97,417.46,500.95,584.45,667.94,751.43,834.92,918.42,1001.91,1085.4,1168.89,1252.39,1335.88,1419.37,1502.86,1586.36,1669.85]
-    },
-    "Silk Cotton (Semal)": {
-      "Avg_Biomass_kg_per_year": 55,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.7,
-      "Lifespan_Years": 30,
-      "CO2_Sequestration_20yrs": [70.65,141.29,211.94,282.59,353.24,423.88,494.53,565.18,635.83,706.47,777.12,847.77,918.42,989.06,1059.71,1130.36,1201.01,1271.65,1342.3,1412.95]
-    },
-    "Indian Coral Tree (Erythrina)": {
-      "Avg_Biomass_kg_per_year": 40,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.75,
-      "Lifespan_Years": 20,
-      "CO2_Sequestration_20yrs": [55.05,110.1,165.15,220.2,275.25,330.3,385.35,440.4,495.45,550.5,605.55,660.6,715.65,770.7,825.75,880.8,935.85,990.9,1045.95,1101.0]
-    },
-    "Bael (Aegle marmelos)": {
-      "Avg_Biomass_kg_per_year": 45,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.8,
-      "Lifespan_Years": 35,
-      "CO2_Sequestration_20yrs": [66.06,132.12,198.18,264.24,330.3,396.36,462.42,528.48,594.54,660.6,726.66,792.72,858.78,924.84,990.9,1056.96,1123.02,1189.08,1255.14,1321.2]
-    },
-    "Flame of the Forest (Palash)": {
-      "Avg_Biomass_kg_per_year": 50,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.7,
-      "Lifespan_Years": 30,
-      "CO2_Sequestration_20yrs": [64.22,128.45,192.67,256.9,321.12,385.35,449.57,513.8,578.02,642.25,706.47,770.7,834.92,899.15,963.37,1027.6,1091.82,1156.05,1220.27,1284.5]
-    },
-    "Bamboo": {
-      "Avg_Biomass_kg_per_year": 100,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.85,
-      "Lifespan_Years": 15,
-      "CO2_Sequestration_20yrs": [155.97,311.95,467.92,623.9,779.88,935.85,1091.83,1247.8,1403.77,1559.75,1715.72,1871.7,2027.67,2183.65,2339.62,2339.62,2339.62,2339.62,2339.62,2339.62]
-    },
-    "Subabul (Leucaena)": {
-      "Avg_Biomass_kg_per_year": 60,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.8,
-      "Lifespan_Years": 20,
-      "CO2_Sequestration_20yrs": [88.08,176.16,264.24,352.32,440.4,528.48,616.56,704.64,792.72,880.8,968.88,1056.96,1145.04,1233.12,1321.2,1409.28,1497.36,1585.44,1673.52,1761.6]
-    },
-    "Red Sandalwood": {
-      "Avg_Biomass_kg_per_year": 70,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.65,
-      "Lifespan_Years": 40,
-      "CO2_Sequestration_20yrs": [83.49,166.98,250.48,333.97,417.46,500.95,584.45,667.94,751.43,834.92,918.42,1001.91,1085.4,1168.89,1252.39,1335.88,1419.37,1502.86,1586.36,1669.85]
-    },
-    "Ashoka Tree (Saraca asoca)": {
-      "Avg_Biomass_kg_per_year": 45,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.75,
-      "Lifespan_Years": 25,
-      "CO2_Sequestration_20yrs": [61.93,123.86,185.79,247.73,309.66,371.59,433.52,495.45,557.38,619.31,681.24,743.18,805.11,867.04,928.97,990.9,1052.83,1114.76,1176.69,1238.62]
-    },
-    "Indian Kino (Pterocarpus marsupium)": {
-      "Avg_Biomass_kg_per_year": 65,
-      "Carbon_Content_Ratio": 0.5,
-      "CO2_Conversion_Factor": 3.67,
-      "Survival_Rate": 0.7,
-      "Lifespan_Years": 40,
-      "CO2_Sequestration_20yrs": [83.49,166.98,250.48,333.97,417.46,500.95,584.45,667.94,751.43,834.92,918.42,1001.91,1085.4,1168.89,1252.39,1335.88,1419.37,1502.86,1586.36,1669.85]
-    }
-}
+REPORT_POLL_SECONDS = 1.0
+MAX_SITE_ROWS = 1000
 
-def main():
+
+def polling_fragment(func):
+    """A fragment that reruns itself every REPORT_POLL_SECONDS while it is on the page."""
+    return st.fragment(run_every=REPORT_POLL_SECONDS)(func)
+
+
+def incremental_projection(catalog, plan, horizon):
+    """The session's running aggregates and formatted details rows, moved to ``plan``.
+
+    Only species whose counts changed since the last rerun are recomputed; a new
+    catalog version or horizon starts over.
+    """
+    import charts
+    
+    state = st.session_state.get("incremental")
+    if state is None or state[0] != (catalog.version, horizon):
+        state = (catalog.version, horizon), IncrementalProjection(catalog.matrix, horizon), {}
+        st.session_state.incremental = state
+    _, aggregate, rows = state
+    
+    matrix = catalog.matrix
+    for i in aggregate.update(dict(plan)).tolist():
+        if aggregate.counts[i] > 0:
+            rows[i] = charts.details_row(
+                matrix.names[i], aggregate.counts[i], matrix.survival[i],
+                aggregate.survivors[i], matrix.lifespan[i], aggregate.totals[i]
+            )
+        else:
+            rows.pop(i, None)
+    return aggregate, rows
+
+
+# Projections, figures and exports are keyed by plan key (catalog version,
+# normalized plan and view options) in the process-wide shared cache, so every
+# session asking for the same plan reuses one result.
+
+def cached_projection(key, aggregate):
+    return shared_cache.get_or_compute(("projection", key), aggregate.projection, persist=True)
+
+
+def cached_schedule(catalog, key, plan, horizon, rounds, every):
+    return shared_cache.get_or_compute(
+        ("schedule", key),
+        lambda: project_schedule(catalog.matrix, repeat_schedule(dict(plan), rounds, every), horizon),
+        persist=True
+    )
+
+
+@st.cache_data(max_entries=32, show_spinner="Simulating tree survival...")
+def simulate_plan(_catalog, catalog_version, plan, horizon, trials, seed):
+    return simulate_survival(_catalog.matrix, dict(plan), trials=trials, seed=seed, horizon=horizon)
+
+
+def build_spec(kind, projection, bands, options):
+    import charts
     
-    st.title("🌱 Tree Planting CO₂ Impact Dashboard")
-    st.markdown("**Visualize the carbon sequestration potential of different tree species over 20 years**")
+    fig, size = charts.build_figure(kind, projection, bands, options)
+    return fig.to_json(), size
+
+
+def cached_figure(kind, key, options, projection, bands=None):
+    """The figure and its payload size; the shared cache holds the figure's JSON, as sent to the browser."""
+    import charts
+    
+    spec, size = shared_cache.get_or_compute(
+        ("figure", kind, key, options),
+        lambda: build_spec(kind, projection, bands, options),
+        persist=True
+    )
+    return charts.SerializedFigure(spec), size
+
+
+def cached_register_projection(catalog, key, register, horizon):
+    return shared_cache.get_or_compute(
+        ("register_projection", key),
+        lambda: project_schedule(catalog.matrix, register.schedule(), horizon),
+        persist=True
+    )
+
+
+def timed_stage(name):
+    return st.session_state.rerun_timer.stage(name)
+
+
+def show_figure(kind, key, options, projection, bands=None):
+    with timed_stage(f"chart_{kind}") as record:
+        fig, size = cached_figure(kind, key, options, projection, bands)
+        st.plotly_chart(fig, use_container_width=True)
+        record["bytes"] = size
+    if st.session_state.get("show_payload_sizes"):
+        over = options.budget_bytes and size > options.budget_bytes
+        st.caption(f"Payload: {size / 1024:,.1f} KB" + (" (over budget)" if over else ""))
+
+
+def cached_export_csv(key, projection, region_projection=None):
+    import charts
     
+    return shared_cache.get_or_compute(
+        ("export_csv", key),
+        lambda: charts.export_frame(projection, region_projection).to_csv(index=False).encode("utf-8"),
+        persist=True
+    )
+
+
+def cached_regions(catalog, region_set, key, plan, horizon, names):
+    return shared_cache.get_or_compute(
+        ("regions", key),
+        lambda: project_regions(catalog.matrix, dict(plan), region_set, names, horizon),
+        persist=True
+    )
+
+
+def region_specs(region_projection):
+    import charts
     
-    st.sidebar.header("🌳 Tree Selection & Planning")
+    return (
+        charts.region_totals_figure(region_projection).to_json(),
+        charts.region_cumulative_figure(region_projection).to_json()
+    )
+
+
+def cached_region_figures(key, region_projection):
+    import charts
     
-   
+    totals, cumulative = shared_cache.get_or_compute(
+        ("region_figures", key),
+        lambda: region_specs(region_projection),
+        persist=True
+    )
+    size = len(totals.encode("utf-8")) + len(cumulative.encode("utf-8"))
+    return charts.SerializedFigure(totals), charts.SerializedFigure(cumulative), size
+
+
+def headline_metrics(aggregate, bands):
+    """Trees, survivors and CO₂ for Key Metrics: the Monte Carlo medians when simulated."""
+    if bands:
+        return aggregate.total_trees, bands.total_survivors[bands.band(50)], bands.total_co2[bands.band(50)]
+    return aggregate.total_trees, aggregate.total_survivors, aggregate.total_co2
+
+
+@st.fragment
+def metrics_section(aggregate, bands):
+    total_trees, total_survivors, total_co2 = headline_metrics(aggregate, bands)
+    horizon = len(aggregate.years)
+    
+    st.header("📊 Key Metrics")
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("🌱 Total Trees Planted", f"{total_trees:,}")
+    
+    with col2:
+        st.metric("🌳 Expected Survivors", f"{total_survivors:,.0f}")
+        if bands:
+            low, high = bands.total_survivors[[bands.band(5), bands.band(95)]]
+            st.caption(f"90% interval: {low:,.0f} – {high:,.0f}")
+    
+    with col3:
+        st.metric(f"🌍 Total CO₂ Captured ({horizon} years)", f"{total_co2:,.0f} kg")
+        if bands:
+            low, high = bands.total_co2[[bands.band(5), bands.band(95)]]
+            st.caption(f"90% interval: {low:,.0f} – {high:,.0f} kg")
+    
+    with col4:
+        st.metric("♻️ CO₂ per Tree (avg)", f"{total_co2/total_trees:,.0f} kg")
+        if bands:
+            low, high = bands.total_co2[[bands.band(5), bands.band(95)]] / total_trees
+            st.caption(f"90% interval: {low:,.0f} – {high:,.0f} kg")
+    
+    if bands:
+        st.caption(
+            f"Median of {bands.trials:,} simulated survival outcomes; "
+            "shaded bands on the charts show the 5th–95th percentile range."
+        )
+
+
+@st.fragment
+def line_chart_section(key, options, projection, bands):
+    st.subheader(f"CO₂ Sequestration Over {len(projection.years)} Years (Per Species)")
+    show_figure("line", key, options, projection, bands)
+
+
+@st.fragment
+def species_charts_section(key, options, projection):
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader(f"Total CO₂ by Species ({len(projection.years)}-year sum)")
+        show_figure("bar", key, options, projection)
+    
+    with col2:
+        st.subheader("CO₂ Contribution by Species")
+        show_figure("pie", key, options, projection)
+
+
+@st.fragment
+def cumulative_chart_section(key, options, projection, bands):
+    st.subheader("Cumulative CO₂ Sequestration Over Time")
+    show_figure("cumulative", key, options, projection, bands)
+
+
+@st.cache_resource(max_entries=8, show_spinner="Running sensitivity sweep...")
+def cached_sweep(_catalog, key, plan, horizon, spread, steps):
+    return sweep(_catalog.matrix, dict(plan), spread, steps, horizon)
+
+
+@st.fragment
+def sensitivity_section(catalog, key, plan, horizon):
+    import charts
+    
+    with st.expander("📐 Sensitivity Analysis"):
+        st.markdown(
+            f"How much total CO₂ over {horizon} years moves when Survival_Rate, "
+            "Avg_Biomass_kg_per_year or Carbon_Content_Ratio are off by a given percentage."
+        )
+        col1, col2 = st.columns(2)
+        spread = col1.slider("Sweep range (±%)", min_value=5, max_value=90, value=30, step=5) / 100
+        steps = col2.select_slider("Grid steps per parameter", options=[11, 21, 41, 101, 201], value=41)
+        if not st.checkbox("Run sensitivity sweep", value=False, key="run_sensitivity"):
+            return
+        
+        with timed_stage("sensitivity"):
+            result = cached_sweep(catalog, key, plan, horizon, spread, steps)
+        st.caption(f"{result.points:,} grid points covered; the controls below reuse them.")
+        
+        shown = st.slider(
+            "Tornado at ±%", min_value=1, max_value=int(round(spread * 100)),
+            value=min(10, int(round(spread * 100)))
+        ) / 100
+        st.plotly_chart(
+            charts.tornado_figure(result.tornado(shown), result.baseline, shown, SENSITIVITY_LABELS),
+            use_container_width=True
+        )
+        
+        parameters = st.multiselect(
+            "One-at-a-time curves",
+            list(SENSITIVITY_PARAMETERS),
+            default=list(SENSITIVITY_PARAMETERS),
+            format_func=SENSITIVITY_LABELS.get
+        )
+        if parameters:
+            st.plotly_chart(
+                charts.sensitivity_figure(result, parameters, SENSITIVITY_LABELS),
+                use_container_width=True
+            )
+
+
+@st.fragment
+def region_section(key, region_projection):
+    import pandas as pd
+    
+    with timed_stage("chart_regions") as record:
+        totals_fig, cumulative_fig, size = cached_region_figures(key, region_projection)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("Total CO₂ by Region")
+            st.plotly_chart(totals_fig, use_container_width=True)
+        with col2:
+            st.subheader("Cumulative CO₂ by Region")
+            st.plotly_chart(cumulative_fig, use_container_width=True)
+        record["bytes"] = size
+    
+    st.dataframe(
+        pd.DataFrame({
+            "Region": region_projection.regions,
+            "Expected Survivors": region_projection.total_survivors.round(),
+            f"Total CO₂ ({len(region_projection.years)} years, kg)": region_projection.total_co2.round(),
+            "CO₂ per Tree (kg)": (region_projection.total_co2 / region_projection.counts.sum()).round()
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+
+
+@st.fragment
+def site_section(key, catalog, register, horizon):
+    with timed_stage("sites"):
+        sites = shared_cache.get_or_compute(
+            ("sites", key),
+            lambda: register.site_totals(catalog.matrix, horizon),
+            persist=True
+        )
+        co2_column = sites.columns[-1]
+        ranked = sites.sort_values(co2_column, ascending=False)
+        if len(ranked) > MAX_SITE_ROWS:
+            st.caption(f"Top {MAX_SITE_ROWS:,} of {len(ranked):,} sites by CO₂; download the CSV for all of them.")
+        st.dataframe(
+            ranked.head(MAX_SITE_ROWS).round({"Expected Survivors": 0, co2_column: 0}),
+            use_container_width=True,
+            hide_index=True
+        )
+    st.download_button(
+        label="Download Site Totals (CSV)",
+        data=shared_cache.get_or_compute(("sites_csv", key), lambda: ranked.to_csv(index=False).encode("utf-8")),
+        file_name="tree_planting_sites.csv",
+        mime="text/csv"
+    )
+
+
+@st.fragment
+def details_section(key, projection, df_details, region_projection=None):
+    import export
+    
+    with timed_stage("details"):
+        st.dataframe(df_details, use_container_width=True, hide_index=True)
+        csv = cached_export_csv(key, projection, region_projection)
+    
+    st.header("📥 Export Data")
+    st.download_button(
+        label="Download Species Details (CSV)",
+        data=csv,
+        file_name="tree_planting_analysis.csv",
+        mime="text/csv"
+    )
+    
+    st.subheader("Year-by-Year Data")
+    col1, col2 = st.columns([1, 2])
+    fmt = col1.selectbox(
+        "Format",
+        list(export.FORMATS),
+        format_func=lambda fmt: export.FORMATS[fmt][0],
+        key="long_export_format"
+    )
+    label, file_name, mime = export.FORMATS[fmt]
+    col2.caption(
+        "One row per region, species and year with annual and cumulative CO₂ "
+        "and expected survivors, as typed numeric columns."
+    )
+    
+    payload = shared_cache.get(("export", key, fmt))
+    if payload is None and st.button(f"Prepare {label} Export"):
+        with st.spinner("Writing export..."), timed_stage(f"export_{fmt}") as record:
+            # st.download_button turns any file object into bytes held by Streamlit's
+            # media store, so the spooled file can't be streamed to the browser. Reading
+            # it once here lets that copy double as the shared cache entry.
+            with export.spool_export(export.region_projections(projection, region_projection), fmt) as spool:
+                payload = spool.read()
+            record["bytes"] = len(payload)
+        shared_cache.put(("export", key, fmt), payload, persist=True)
+    
+    if payload is not None:
+        st.download_button(
+            label=f"Download Year-by-Year Data ({label})",
+            data=payload,
+            file_name=file_name,
+            mime=mime
+        )
+
+
+def report_inputs(key, bands_key, options, aggregate, projection, bands, df_details,
+                  region_key=None, region_projection=None):
+    """Title, metrics, figures and tables for :func:`reports.submit`, from the cached results."""
+    import export
+    
+    horizon = len(projection.years)
+    total_trees, total_survivors, total_co2 = headline_metrics(aggregate, bands)
+    note = f"Median of {bands.trials:,} simulated survival outcomes" if bands else ""
+    metrics = [
+        ("Total Trees Planted", f"{total_trees:,}", ""),
+        ("Expected Survivors", f"{total_survivors:,.0f}", note),
+        (f"Total CO₂ Captured ({horizon} years)", f"{total_co2:,.0f} kg", note),
+        ("CO₂ per Tree (avg)", f"{total_co2 / total_trees:,.0f} kg", note)
+    ]
+    figures = [
+        (f"CO₂ Sequestration Over {horizon} Years (Per Species)",
+         cached_figure("line", bands_key, options, projection, bands)[0]),
+        (f"Total CO₂ by Species ({horizon}-year sum)", cached_figure("bar", key, options, projection)[0]),
+        ("CO₂ Contribution by Species", cached_figure("pie", key, options, projection)[0]),
+        ("Cumulative CO₂ Sequestration Over Time",
+         cached_figure("cumulative", bands_key, options, projection, bands)[0])
+    ]
+    if region_projection is not None:
+        totals_fig, cumulative_fig, _ = cached_region_figures(region_key, region_projection)
+        figures += [("Total CO₂ by Region", totals_fig), ("Cumulative CO₂ by Region", cumulative_fig)]
+    
+    return (
+        "Tree Planting CO₂ Report",
+        f"{len(projection.species):,} species, {total_trees:,} trees, {horizon}-year projection",
+        metrics,
+        figures,
+        df_details,
+        list(export.region_projections(projection, region_projection)),
+        {"horizon": horizon, "plan": dict(zip(projection.species, projection.counts.astype(int).tolist()))}
+    )
+
+
+@polling_fragment
+def report_progress(key):
+    import reports
+    
+    job = reports.get(key)
+    if job is None or job.done():
+        st.rerun()
+    st.progress(job.progress, text=job.message)
+
+
+@st.fragment
+def report_section(key, inputs):
+    import reports
+    
+    st.subheader("Full Report")
+    st.caption(
+        "Key Metrics, the charts and the species details as one offline HTML page, "
+        "zipped with the species details and year-by-year data as CSV."
+    )
+    job = reports.get(key)
+    if job is not None and not job.done():
+        report_progress(key)
+        return
+    if job is not None and job.error is None:
+        st.download_button(
+            label="Download Report (ZIP)",
+            data=job.payload,
+            file_name="tree_planting_report.zip",
+            mime="application/zip"
+        )
+        return
+    if job is not None:
+        st.error(f"Report failed: {job.error}")
+    
+    if st.button("Generate Report"):
+        try:
+            reports.submit(key, *inputs())
+        except reports.ReportQueueFull as e:
+            st.warning(str(e))
+            return
+        report_progress(key)
+
+
+def apply_mix(plan, names):
+    for species in names:
+        st.session_state[f"check_{species}"] = species in plan
+        if species in plan:
+            st.session_state[f"num_{species}"] = plan[species]
+    st.session_state.selected_species = list(plan.keys())
+
+
+def optimizer_section(catalog, selected_species, horizon):
+    with st.expander("🧮 Species Mix Optimizer"):
+        st.markdown(
+            f"Find the species mix that maximizes survival-adjusted CO₂ over {horizon} years "
+            "for a tree budget, optionally under a cost budget."
+        )
+        
+        col1, col2, col3, col4 = st.columns(4)
+        tree_budget = col1.number_input("Tree budget", min_value=1, max_value=10_000_000, value=1000, step=100)
+        min_count = col2.number_input("Min trees per species", min_value=0, max_value=10000, value=0)
+        max_count = col3.number_input("Max trees per species", min_value=1, max_value=10000, value=10000)
+        cost_budget = col4.number_input("Cost budget (0 = no limit)", min_value=0.0, value=0.0, step=1000.0)
+        only_selected = st.checkbox("Only consider species selected in the sidebar", value=False)
+        
+        costs = np.array(catalog.costs(), dtype=float)
+        if st.checkbox("Edit cost per tree", value=False, help="Costs default to the catalog's Cost_Per_Tree."):
+            import pandas as pd
+            
+            costs = st.data_editor(
+                pd.DataFrame({"Species": catalog.names, "Cost per Tree": costs}),
+                disabled=["Species"],
+                hide_index=True,
+                use_container_width=True,
+                height=250,
+                key="optimizer_costs"
+            )["Cost per Tree"].fillna(0).to_numpy(dtype=float)
+        
+        considered = np.ones(len(catalog), dtype=bool)
+        if only_selected:
+            considered = np.isin(catalog.names, list(selected_species))
+        limits = dict(
+            min_counts=np.where(considered, min_count, 0),
+            max_counts=np.where(considered, max(min_count, max_count), 0)
+        )
+        
+        if st.button("Optimize Mix", type="primary"):
+            try:
+                mix = optimize_mix(
+                    catalog.matrix, tree_budget,
+                    cost_per_tree=costs,
+                    cost_budget=cost_budget or None,
+                    horizon=horizon,
+                    **limits
+                )
+                front = None
+                if costs.any():
+                    front = pareto_frontier(catalog.matrix, tree_budget, costs, horizon=horizon, **limits)
+            except ValueError as e:
+                st.error(f"No feasible mix: {e}")
+            else:
+                st.session_state.optimized_mix = (mix.plan(catalog.names), mix, front, horizon)
+        
+        if "optimized_mix" not in st.session_state:
+            return
+        plan, mix, front, mix_horizon = st.session_state.optimized_mix
+        if not plan:
+            st.info("No species can be planted within these limits.")
+            return
+        
+        import pandas as pd
+        import plotly.express as px
+        
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Trees", f"{mix.trees:,}")
+        col2.metric(f"CO₂ ({mix_horizon} years)", f"{mix.co2:,.0f} kg")
+        col3.metric("Cost", f"{mix.cost:,.2f}")
+        st.dataframe(
+            pd.DataFrame({"Species": list(plan.keys()), "Trees": list(plan.values())}),
+            use_container_width=True,
+            hide_index=True
+        )
+        st.button(
+            "Apply Mix to Sidebar",
+            on_click=apply_mix,
+            args=(plan, catalog.names),
+            disabled=any(count > 10000 for count in plan.values()),
+            help="Sidebar quantities are limited to 10,000 trees per species."
+        )
+        
+        if front is not None and len(front.costs) > 1:
+            st.subheader("CO₂ vs Cost (Pareto frontier)")
+            frontier_fig = px.line(x=front.costs, y=front.co2, markers=True)
+            frontier_fig.update_layout(
+                xaxis_title="Total Cost",
+                yaxis_title=f"CO₂ Captured in {mix_horizon} years (kg)",
+                height=350,
+                template="plotly_white"
+            )
+            st.plotly_chart(frontier_fig, use_container_width=True)
+
+
+def debug_panel(timer):
+    if not st.sidebar.checkbox("🐞 Show timing debug panel", value=False, key="show_timings"):
+        return
+    
+    import pandas as pd
+    
+    with st.sidebar.expander("⏱️ Rerun Timings", expanded=True):
+        selection = timer.selection
+        if selection:
+            st.caption(
+                f"{selection['species']:,} species, {selection['trees']:,} trees, "
+                f"{selection['horizon']} years"
+            )
+        st.dataframe(
+            pd.DataFrame({
+                "Stage": [record["stage"] for record in timer.stages],
+                "ms": [round(record["ms"], 1) for record in timer.stages],
+                "KB": [round(record["bytes"] / 1024, 1) if record.get("bytes") else None
+                       for record in timer.stages]
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+        summary = timing.stats.summary()
+        st.caption(f"This process, last {timing.WINDOW:,} samples per stage")
+        st.dataframe(
+            pd.DataFrame({
+                "Stage": list(summary.keys()),
+                "Runs": [row["count"] for row in summary.values()],
+                "p50 ms": [round(row["p50_ms"], 1) for row in summary.values()],
+                "p95 ms": [round(row["p95_ms"], 1) for row in summary.values()]
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+        cache = shared_cache.stats()
+        lookups = cache["hits"] + cache["disk_hits"] + cache["misses"]
+        st.caption(
+            f"Shared cache: {cache['entries']:,} entries, {cache['bytes'] / 2**20:,.1f} of "
+            f"{cache['max_bytes'] / 2**20:,.0f} MB, "
+            f"{(cache['hits'] + cache['disk_hits']) / lookups if lookups else 0:.0%} hit rate "
+            f"({cache['hits']:,} memory, {cache['disk_hits']:,} disk, {cache['misses']:,} misses), "
+            f"{cache['evictions']:,} evicted"
+        )
+
+
+def register_upload(catalog, horizon):
+    """The uploaded planting register aggregated against ``catalog`` and its content hash, or (None, None)."""
+    st.sidebar.subheader("📤 Planting Register")
+    uploaded = st.sidebar.file_uploader(
+        "Upload a register (CSV or Parquet)",
+        type=["csv", "parquet", "pq"],
+        help="One row per plot with species and count columns, optionally planting_year and site. "
+             "Replaces the species selection and planting schedule below."
+    )
+    if uploaded is None:
+        return None, None
+    
+    import hashlib
+    import pandas as pd
+    import registers
+    
+    digest = hashlib.sha1(uploaded.getbuffer()).hexdigest()
+    uploaded.seek(0)
+    try:
+        with timed_stage("register"):
+            register = shared_cache.get_or_compute(
+                ("register", catalog.version, digest),
+                lambda: registers.read_register(uploaded, catalog.names, registers.register_format(uploaded.name)),
+                persist=True
+            )
+    except ValueError as e:
+        st.sidebar.error(f"Could not read register: {e}")
+        return None, None
+    
+    st.sidebar.caption(
+        f"{register.rows:,} rows: {register.total_trees:,} trees of {len(register.plan()):,} species "
+        f"at {len(register.sites):,} sites, planted {register.first_year}–{register.last_year}. "
+        f"{register.skipped:,} rows without a usable count or year were skipped."
+    )
+    if register.last_year - register.first_year + 1 > horizon:
+        st.sidebar.caption(f"Plantings after year {horizon} of the register fall outside the projection.")
+    if register.unknown:
+        with st.sidebar.expander(f"⚠️ {len(register.unknown):,} species not in the catalog"):
+            st.dataframe(
+                pd.DataFrame({"Species": list(register.unknown.keys()), "Trees": list(register.unknown.values())}),
+                use_container_width=True,
+                hide_index=True
+            )
+    return register, digest
+
+
+def species_selection(catalog):
     col1, col2 = st.sidebar.columns(2)
     select_all = col1.button("Select All")
     deselect_all = col2.button("Deselect All")
     
    
     if 'selected_species' not in st.session_state:
-        st.session_state.selected_species = list(TREE_DATA.keys())[:3]  
+        st.session_state.selected_species = catalog.names[:3]  
     
     if select_all:
-        st.session_state.selected_species = list(TREE_DATA.keys())
+        st.session_state.selected_species = catalog.names
     if deselect_all:
         st.session_state.selected_species = []
     
@@ -316,7 +669,7 @@ def main():
     st.sidebar.subheader("Select Species & Quantity")
     selected_species = {}
     
-    for species in TREE_DATA.keys():
+    for species in catalog.names:
         col1, col2 = st.sidebar.columns([3, 1])
 
         is_selected = col1.checkbox(
@@ -337,199 +690,185 @@ def main():
             selected_species[species] = num_trees
     
     st.session_state.selected_species = list(selected_species.keys())
-    
-    if not selected_species:
-        st.warning("Please select at least one tree species to see the analysis.")
-        return
-    
-    total_trees = sum(selected_species.values())
-    total_survivors = sum(
-        num_trees * TREE_DATA[species]["Survival_Rate"] 
-        for species, num_trees in selected_species.items()
-    )
-    total_co2_20yrs = sum(
-        sum(TREE_DATA[species]["CO2_Sequestration_20yrs"]) * num_trees * TREE_DATA[species]["Survival_Rate"]
-        for species, num_trees in selected_species.items()
+    return selected_species
+
+
+def planting_schedule(horizon):
+    st.sidebar.subheader("📅 Planting Schedule")
+    rounds = st.sidebar.number_input(
+        "Planting rounds",
+        min_value=1,
+        max_value=MAX_HORIZON,
+        value=1,
+        help="Plant the quantities above this many times. Each round is a cohort "
+             "that ages and loses trees on its own."
     )
+    every = 1
+    if rounds > 1:
+        every = st.sidebar.number_input("Years between rounds", min_value=1, max_value=MAX_HORIZON - 1, value=1)
+        if 1 + (rounds - 1) * every > horizon:
+            st.sidebar.caption(f"Rounds planted after year {horizon} fall outside the projection.")
+    return rounds, every
+
+
+def main():
+    timer = st.session_state.rerun_timer = timing.RerunTimer()
+    dashboard(timer)
+    timer.finish()
+    debug_panel(timer)
+
+
+def dashboard(timer):
     
-    st.header("📊 Key Metrics")
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric("🌱 Total Trees Planted", f"{total_trees:,}")
-    
-    with col2:
-        st.metric("🌳 Expected Survivors", f"{total_survivors:,.0f}")
-    
-    with col3:
-        st.metric("🌍 Total CO₂ Captured (20 years)", f"{total_co2_20yrs:,.0f} kg")
+    st.title("🌱 Tree Planting CO₂ Impact Dashboard")
+    st.markdown("**Visualize the carbon sequestration potential of different tree species over time**")
     
-    with col4:
-        st.metric("♻️ CO₂ per Tree (avg)", f"{total_co2_20yrs/total_trees:,.0f} kg")
     
-    st.header("📈 CO₂ Sequestration Analysis")
+    st.sidebar.header("🌳 Tree Selection & Planning")
     
-
-    st.subheader("CO₂ Sequestration Over 20 Years (Per Species)")
-  
-    years = list(range(1, 21))
-    line_fig = go.Figure()
+    catalog_paths = list_catalogs()
+    catalog_path = catalog_paths[0]
+    if len(catalog_paths) > 1:
+        catalog_path = st.sidebar.selectbox(
+            "Species Catalog",
+            catalog_paths,
+            format_func=lambda path: os.path.splitext(os.path.basename(path))[0]
+        )
     
-    colors = px.colors.qualitative.Set3
+    try:
+        with timed_stage("catalog"):
+            catalog = load_catalog(catalog_path)
+    except (OSError, CatalogError) as e:
+        st.error(f"Could not load species catalog: {e}")
+        return
     
-    for i, (species, num_trees) in enumerate(selected_species.items()):
-        survival_rate = TREE_DATA[species]["Survival_Rate"]
-        co2_data = [
-            co2_per_tree * num_trees * survival_rate 
-            for co2_per_tree in TREE_DATA[species]["CO2_Sequestration_20yrs"]
-        ]
-        
-        line_fig.add_trace(go.Scatter(
-            x=years,
-            y=co2_data,
-            mode='lines',
-            name=species,
-            line=dict(
-                color=colors[i % len(colors)],
-                width=3,
-                shape='spline',  
-                smoothing=0.3
-            ),
-            hovertemplate=f"<b>{species}</b><br>" +
-                         "Year: %{x}<br>" +
-                         "CO₂ Captured: %{y:,.0f} kg<extra></extra>"
-        ))
-    
-    line_fig.update_layout(
-        title="",
-        xaxis_title="Year",
-        yaxis_title="CO₂ Captured (kg)",
-        hovermode='x unified',
-        height=500,
-        showlegend=True,
-        template="plotly_white"
+    horizon = st.sidebar.slider(
+        "Projection Horizon (years)",
+        min_value=1,
+        max_value=MAX_HORIZON,
+        value=catalog.matrix.horizon,
+        help="Years beyond the catalog's published curves are derived from biomass, "
+             "carbon content, CO₂ conversion and lifespan."
     )
     
-    st.plotly_chart(line_fig, use_container_width=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader("Total CO₂ by Species (20-year sum)")
-        
-        species_totals = {}
-        for species, num_trees in selected_species.items():
-            survival_rate = TREE_DATA[species]["Survival_Rate"]
-            total_co2 = sum(TREE_DATA[species]["CO2_Sequestration_20yrs"]) * num_trees * survival_rate
-            species_totals[species] = total_co2
-        
-        bar_fig = px.bar(
-            x=list(species_totals.keys()),
-            y=list(species_totals.values()),
-            color=list(species_totals.values()),
-            color_continuous_scale="Viridis"
+    register, register_digest = register_upload(catalog, horizon)
+    if register is None:
+        selected_species = species_selection(catalog)
+        rounds, every = planting_schedule(horizon)
+    else:
+        selected_species = register.plan()
+        rounds, every = 1, 1
+    staggered = rounds > 1 or register is not None
+    
+    st.sidebar.subheader("🎲 Survival Uncertainty")
+    monte_carlo = st.sidebar.checkbox(
+        "Simulate survival (Monte Carlo)",
+        value=False,
+        disabled=staggered,
+        help="Available for single-round planting."
+    ) and not staggered
+    if monte_carlo:
+        trials = st.sidebar.number_input(
+            "Trials", min_value=100, max_value=1_000_000, value=10_000, step=1_000
         )
-        
-        bar_fig.update_layout(
-            xaxis_title="Tree Species",
-            yaxis_title="Total CO₂ Captured (kg)",
-            showlegend=False,
-            height=400,
-            template="plotly_white"
-        )
-        
-        bar_fig.update_xaxes(tickangle=45)
-        
-        st.plotly_chart(bar_fig, use_container_width=True)
+        seed = st.sidebar.number_input("Random seed", min_value=0, max_value=2**32 - 1, value=42)
     
-    with col2:
-        st.subheader("CO₂ Contribution by Species")
-        
-        pie_fig = px.pie(
-            values=list(species_totals.values()),
-            names=list(species_totals.keys()),
-            hole=0.4,
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        
-        pie_fig.update_traces(
-            hovertemplate="<b>%{label}</b><br>" +
-                         "CO₂: %{value:,.0f} kg<br>" +
-                         "Percentage: %{percent}<extra></extra>"
-        )
-        
-        pie_fig.update_layout(
-            height=400,
-            showlegend=True,
-            template="plotly_white"
+    with st.sidebar.expander("⚡ Chart Rendering"):
+        lightweight = st.checkbox(
+            "Lightweight charts for large selections", value=True,
+            help="Switch to WebGL traces, group small species into 'Other' and "
+                 "keep each chart under a payload budget."
         )
-        
-        st.plotly_chart(pie_fig, use_container_width=True)
-    
-    st.subheader("Cumulative CO₂ Sequestration Over Time")
-  
-    cumulative_fig = go.Figure()
-    
-    for i, (species, num_trees) in enumerate(selected_species.items()):
-        survival_rate = TREE_DATA[species]["Survival_Rate"]
-        annual_co2 = [
-            co2_per_tree * num_trees * survival_rate 
-            for co2_per_tree in TREE_DATA[species]["CO2_Sequestration_20yrs"]
-        ]
-        cumulative_co2 = np.cumsum(annual_co2)
-        
-        cumulative_fig.add_trace(go.Scatter(
-            x=years,
-            y=cumulative_co2,
-            mode='lines',
-            name=species,
-            fill='tonexty' if i > 0 else 'tozeroy',
-            line=dict(width=0.5),
-            fillcolor=colors[i % len(colors)],
-            hovertemplate=f"<b>{species}</b><br>" +
-                         "Year: %{x}<br>" +
-                         "Cumulative CO₂: %{y:,.0f} kg<extra></extra>"
-        ))
-    
-    cumulative_fig.update_layout(
-        title="",
-        xaxis_title="Year",
-        yaxis_title="Cumulative CO₂ Captured (kg)",
-        hovermode='x unified',
-        height=500,
-        template="plotly_white"
-    )
-    
-    st.plotly_chart(cumulative_fig, use_container_width=True)
+        if lightweight:
+            render_settings = (
+                st.number_input("Use WebGL above (series)", min_value=1, value=20),
+                st.number_input("Max series before grouping (0 = never)", min_value=0, value=15),
+                1024 * st.number_input("Payload budget per chart (KB, 0 = none)", min_value=0, value=1024)
+            )
+        else:
+            render_settings = (10**9, 0, 0)
+        st.checkbox("Show chart payload sizes", value=False, key="show_payload_sizes")
+    
+    region_set = None
+    region_names = []
+    if os.path.exists(DEFAULT_REGIONS):
+        try:
+            region_set = load_regions()
+        except CatalogError as e:
+            st.sidebar.error(f"Could not load region profiles: {e}")
+        else:
+            region_names = st.sidebar.multiselect(
+                "🗺️ Compare Regions",
+                region_set.names,
+                disabled=staggered,
+                help="Apply regional survival and growth adjustments to the same plan "
+                     "(single-round planting)."
+            ) if not staggered else []
+    
+    optimizer_section(catalog, selected_species, horizon)
     
-    st.header("📋 Species Details")
+    if not selected_species:
+        st.warning("Please select at least one tree species to see the analysis.")
+        return
     
-    details_data = []
-    for species, num_trees in selected_species.items():
-        data = TREE_DATA[species]
-        total_co2_species = sum(data["CO2_Sequestration_20yrs"]) * num_trees * data["Survival_Rate"]
+    import charts
+    
+    render_options = charts.RenderOptions(*render_settings)
+    
+    plan = normalize_plan(catalog.matrix, selected_species)
+    bands_options = (int(trials), int(seed)) if monte_carlo else None
+    schedule_options = ("schedule", int(rounds), int(every)) if rounds > 1 else None
+    if register is not None:
+        schedule_options = ("register", register_digest)
+    key = plan_key(catalog.version, plan, horizon, schedule_options)
+    bands_key = plan_key(catalog.version, plan, horizon, schedule_options, bands_options)
+    timer.selection = {"species": len(plan), "trees": sum(count for _, count in plan), "horizon": horizon}
+    
+    with timed_stage("metrics"):
+        if register is not None:
+            projection = aggregate = cached_register_projection(catalog, key, register, horizon)
+        elif staggered:
+            projection = aggregate = cached_schedule(catalog, key, plan, horizon, int(rounds), int(every))
+        else:
+            aggregate, detail_rows = incremental_projection(catalog, plan, horizon)
+        bands = None
+        if monte_carlo:
+            bands = simulate_plan(catalog, catalog.version, plan, horizon, *bands_options)
         
-        details_data.append({
-            "Species": species,
-            "Trees Planted": num_trees,
-            "Survival Rate": f"{data['Survival_Rate']:.0%}",
-            "Expected Survivors": f"{num_trees * data['Survival_Rate']:.0f}",
-            "Lifespan (years)": data["Lifespan_Years"],
-            "Total CO₂ (20 years)": f"{total_co2_species:,.0f} kg",
-            "CO₂ per Tree": f"{total_co2_species/num_trees:,.0f} kg"
-        })
-    
-    df_details = pd.DataFrame(details_data)
-    st.dataframe(df_details, use_container_width=True, hide_index=True)
+        metrics_section(aggregate, bands)
     
-    st.header("📥 Export Data")
+    if not staggered:
+        with timed_stage("projection"):
+            projection = cached_projection(key, aggregate)
     
-    csv = df_details.to_csv(index=False)
-    st.download_button(
-        label="Download Species Details (CSV)",
-        data=csv,
-        file_name="tree_planting_analysis.csv",
-        mime="text/csv"
+    st.header("📈 CO₂ Sequestration Analysis")
+    line_chart_section(bands_key, render_options, projection, bands)
+    species_charts_section(key, render_options, projection)
+    cumulative_chart_section(bands_key, render_options, projection, bands)
+    if not staggered:
+        sensitivity_section(catalog, key, plan, horizon)
+    
+    region_key = region_projection = None
+    if region_names:
+        region_key = plan_key(catalog.version, plan, horizon, region_set.version, tuple(region_names))
+        region_projection = cached_regions(catalog, region_set, region_key, plan, horizon, tuple(region_names))
+        st.header("🗺️ Region Comparison")
+        region_section(region_key, region_projection)
+    
+    if register is not None:
+        st.header("🏞️ Sites")
+        site_section(key, catalog, register, horizon)
+    
+    st.header("📋 Species Details")
+    if staggered:
+        df_details = charts.details_frame(projection)
+    else:
+        df_details = charts.details_table((detail_rows[i] for i in aggregate.selected().tolist()), horizon)
+    details_section(region_key or key, projection, df_details, region_projection)
+    report_section(
+        (bands_key, region_key, render_options),
+        lambda: report_inputs(key, bands_key, render_options, aggregate, projection, bands, df_details,
+                              region_key, region_projection)
     )
     
     st.markdown("---")
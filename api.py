@@ -0,0 +1,336 @@
+"""Stand-alone JSON projection API, served without the dashboard.
+
+    python api.py --port 8080 --workers 4
+
+``POST /v1/project`` takes ``{"plan": {species: count}, "horizon": 20}`` (horizon
+optional) and returns the dashboard's Key Metrics, the annual and cumulative
+totals per year and per-species totals. ``GET /v1/species`` lists the catalog
+and ``GET /healthz`` reports the cache state.
+
+Requests are handled on an asyncio event loop. Plans that arrive within a short
+window are evaluated together in one vectorized pass, and encoded responses
+are kept in an LRU cache keyed by the normalized plan, so repeated plans are
+answered without touching NumPy. With ``--workers`` several processes share
+the port (SO_REUSEPORT) and each keeps its own cache.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sys
+from collections import OrderedDict
+
+from catalog import DEFAULT_CATALOG, CatalogError, load_catalog
+from growth import MAX_HORIZON
+from projection import evaluate_plan_series, normalize_plan, plan_error, plan_key
+
+
+CACHE_ENTRIES = 4096
+BATCH_WINDOW = 0.002
+MAX_BATCH = 256
+MAX_BODY = 1024 * 1024
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class LRUCache:
+    def __init__(self, max_entries=CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def encode_results(catalog, plans, horizon):
+    """Evaluate normalized plans in one pass and encode each response body."""
+    series = evaluate_plan_series(catalog.matrix, [dict(plan) for plan in plans], horizon)
+    metrics = series.metrics
+    names = catalog.matrix.names
+    years = series.years.tolist()
+    cumulative = series.cumulative
+
+    bodies = []
+    for p in range(len(plans)):
+        start, stop = series.offsets[p], series.offsets[p + 1]
+        counts = series.counts[start:stop]
+        co2 = series.co2[start:stop]
+        bodies.append(json.dumps({
+            "catalog_version": catalog.version,
+            "horizon": len(years),
+            "metrics": {
+                "total_trees": int(metrics.total_trees[p]),
+                "expected_survivors": float(metrics.survivors[p]),
+                "total_co2_kg": float(metrics.co2[p]),
+                "co2_per_tree_kg": float(metrics.co2_per_tree[p]),
+            },
+            "years": years,
+            "annual_co2_kg": series.annual[p].tolist(),
+            "cumulative_co2_kg": cumulative[p].tolist(),
+            "species": [
+                {
+                    "species": names[i],
+                    "trees": int(count),
+                    "expected_survivors": float(survivors),
+                    "total_co2_kg": float(total),
+                    "co2_per_tree_kg": float(total / count) if count else 0.0,
+                }
+                for i, count, survivors, total in zip(
+                    series.species_idx[start:stop].tolist(), counts.tolist(),
+                    series.survivors[start:stop].tolist(), co2.tolist(),
+                )
+            ],
+        }).encode("utf-8"))
+    return bodies
+
+
+class ProjectionService:
+    """Validates plans, answers from the LRU cache and batches the misses."""
+
+    def __init__(self, catalog, cache_entries=CACHE_ENTRIES, batch_window=BATCH_WINDOW, max_batch=MAX_BATCH):
+        self.catalog = catalog
+        self.cache = LRUCache(cache_entries)
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.batches = 0
+        self._pending = []
+        self._inflight = {}
+        self._timer = None
+
+    def parse(self, body):
+        try:
+            request = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ApiError(400, f"request body is not valid JSON: {e}") from e
+        if not isinstance(request, dict):
+            raise ApiError(400, "request body must be a JSON object")
+
+        plan = request.get("plan")
+        error = plan_error(self.catalog.matrix, plan)
+        if error is not None:
+            raise ApiError(400, error)
+        plan = normalize_plan(self.catalog.matrix, plan)
+        if not plan:
+            raise ApiError(400, "plan has no trees")
+
+        horizon = request.get("horizon")
+        if horizon is not None and (isinstance(horizon, bool) or not isinstance(horizon, int)
+                                    or not 1 <= horizon <= MAX_HORIZON):
+            raise ApiError(400, f"horizon must be an integer between 1 and {MAX_HORIZON}")
+        return plan, horizon or self.catalog.matrix.horizon
+
+    async def project(self, body):
+        plan, horizon = self.parse(body)
+        key = plan_key(self.catalog.version, plan, horizon)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = asyncio.get_running_loop().create_future()
+            self._pending.append((key, plan, horizon, future))
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        by_horizon = {}
+        for item in pending:
+            by_horizon.setdefault(item[2], []).append(item)
+        for horizon, items in by_horizon.items():
+            self.batches += 1
+            try:
+                bodies = encode_results(self.catalog, [plan for _, plan, _, _ in items], horizon)
+            except Exception as e:
+                for key, _, _, future in items:
+                    self._inflight.pop(key, None)
+                    future.set_exception(e)
+                continue
+            for (key, _, _, future), body in zip(items, bodies):
+                self.cache.put(key, body)
+                self._inflight.pop(key, None)
+                future.set_result(body)
+
+    def species(self):
+        matrix = self.catalog.matrix
+        return json.dumps({
+            "catalog_version": self.catalog.version,
+            "horizon": matrix.horizon,
+            "species": matrix.names,
+        }).encode("utf-8")
+
+    def health(self):
+        return json.dumps({
+            "status": "ok",
+            "pid": os.getpid(),
+            "catalog_version": self.catalog.version,
+            "cache": {"entries": len(self.cache), "hits": self.cache.hits, "misses": self.cache.misses},
+            "batches": self.batches,
+        }).encode("utf-8")
+
+    async def dispatch(self, method, path, body):
+        routes = {"/v1/project": "POST", "/v1/species": "GET", "/healthz": "GET"}
+        if path not in routes:
+            raise ApiError(404, f"no route for {path}")
+        if method != routes[path]:
+            raise ApiError(405, f"{path} accepts {routes[path]} only")
+
+        if path == "/v1/project":
+            return await self.project(body)
+        return self.species() if path == "/v1/species" else self.health()
+
+
+def _response(status, body, keep_alive):
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def handle_connection(service, reader, writer):
+    """A minimal HTTP/1.1 loop: Content-Length bodies and keep-alive, no chunked uploads."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            try:
+                method, target, version = request_line.decode("latin-1").split()
+            except ValueError:
+                writer.write(_response(400, b'{"error": "malformed request line"}', False))
+                break
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+            try:
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    raise ApiError(413, f"request body is larger than {MAX_BODY:,} bytes")
+                body = await reader.readexactly(length) if length else b""
+                status, payload = 200, await service.dispatch(method, target.split("?", 1)[0], body)
+            except ApiError as e:
+                status, payload = e.status, json.dumps({"error": str(e)}).encode("utf-8")
+                keep_alive = keep_alive and e.status != 413
+            except ValueError:
+                status, payload, keep_alive = 400, b'{"error": "invalid Content-Length"}', False
+            except asyncio.IncompleteReadError:
+                break
+            except Exception as e:
+                status, payload = 500, json.dumps({"error": f"{type(e).__name__}: {e}"}).encode("utf-8")
+
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host, port, catalog_path, cache_entries, batch_window, max_batch, reuse_port=False):
+    service = ProjectionService(load_catalog(catalog_path), cache_entries, batch_window, max_batch)
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(service, reader, writer),
+        host, port, reuse_port=reuse_port or None, backlog=1024,
+    )
+    async with server:
+        await server.serve_forever()
+
+
+def _run_worker(*args):
+    try:
+        asyncio.run(serve(*args, reuse_port=True))
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve plan projections as a JSON HTTP API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--catalog", default=DEFAULT_CATALOG, help="species catalog JSON")
+    parser.add_argument("--workers", type=int, default=1, help="server processes sharing the port")
+    parser.add_argument("--cache-entries", type=int, default=CACHE_ENTRIES, help="LRU result cache size per process")
+    parser.add_argument("--batch-window-ms", type=float, default=BATCH_WINDOW * 1000,
+                        help="how long to collect concurrent plans into one evaluation")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH, help="evaluate at once when this many are waiting")
+    args = parser.parse_args(argv)
+
+    try:
+        load_catalog(args.catalog)
+    except (OSError, CatalogError) as e:
+        parser.error(f"could not load catalog: {e}")
+    if args.workers > 1 and not hasattr(socket, "SO_REUSEPORT"):
+        parser.error("--workers needs SO_REUSEPORT, which this platform does not provide")
+
+    config = (args.host, args.port, args.catalog, args.cache_entries, args.batch_window_ms / 1000, args.max_batch)
+    print(f"Serving {args.catalog} on http://{args.host}:{args.port} with {args.workers} worker(s)", file=sys.stderr)
+    if args.workers <= 1:
+        try:
+            asyncio.run(serve(*config))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    workers = [multiprocessing.Process(target=_run_worker, args=config, daemon=True) for _ in range(args.workers)]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
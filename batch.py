@@ -0,0 +1,211 @@
+"""Headless batch scoring of planting plans.
+
+Reads plans as JSON lines (``{"plan_id": ..., "plan": {species: count}}`` or a bare
+``{species: count}`` mapping per line), scores them in chunks across a process pool
+and streams the dashboard's Key Metrics to CSV or Parquet::
+
+    python batch.py plans.jsonl -o scores.parquet --workers 8 --chunk-size 5000
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from catalog import DEFAULT_CATALOG, load_catalog
+from growth import MAX_HORIZON
+from projection import evaluate_plans, plan_error
+
+
+COLUMNS = ["plan_id", "total_trees", "expected_survivors", "total_co2_kg", "co2_per_tree_kg", "error"]
+
+_worker_catalog = None
+
+
+class InvalidLine:
+    """Stands in for the plan of a line that is not valid JSON."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def read_plans(path):
+    """Yield ``(plan_id, plan)`` pairs from a JSON-lines file ('-' for stdin).
+
+    A line that does not parse yields an :class:`InvalidLine` in place of its
+    plan, so it gets an error row instead of ending the run.
+    """
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, InvalidLine(f"invalid JSON: {e.msg} at column {e.colno}")
+                continue
+            if isinstance(record, dict) and isinstance(record.get("plan"), dict):
+                yield record.get("plan_id", line_no), record["plan"]
+            else:
+                yield line_no, record
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def score_chunk(catalog, chunk, horizon=None):
+    errors = [
+        plan.error if isinstance(plan, InvalidLine) else plan_error(catalog.matrix, plan)
+        for _, plan in chunk
+    ]
+    valid = [plan for (_, plan), error in zip(chunk, errors) if error is None]
+    metrics = evaluate_plans(catalog.matrix, valid, horizon) if valid else None
+
+    rows = []
+    j = 0
+    for (plan_id, _), error in zip(chunk, errors):
+        if error is not None:
+            rows.append((plan_id, None, None, None, None, error))
+            continue
+        rows.append((
+            plan_id,
+            int(metrics.total_trees[j]),
+            float(metrics.survivors[j]),
+            float(metrics.co2[j]),
+            float(metrics.co2_per_tree[j]),
+            None,
+        ))
+        j += 1
+    return rows
+
+
+def _init_worker(catalog_path):
+    global _worker_catalog
+    _worker_catalog = load_catalog(catalog_path)
+
+
+def _score_in_worker(chunk, horizon):
+    return score_chunk(_worker_catalog, chunk, horizon)
+
+
+def score_plans(plans, catalog_path=DEFAULT_CATALOG, workers=None, chunk_size=2000, horizon=None):
+    """Yield scored row chunks in input order, keeping at most two chunks per worker in flight."""
+    chunks = chunked(plans, chunk_size)
+    workers = os.cpu_count() if workers is None else workers
+
+    if workers <= 1:
+        catalog = load_catalog(catalog_path)
+        for chunk in chunks:
+            yield score_chunk(catalog, chunk, horizon)
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(catalog_path,)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_score_in_worker, chunk, horizon))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class CsvSink:
+    def __init__(self, path):
+        self._file = sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(COLUMNS)
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+class ParquetSink:
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise SystemExit("Parquet output requires pyarrow (pip install pyarrow)") from e
+
+        self._pa = pa
+        self._schema = pa.schema([
+            ("plan_id", pa.string()),
+            ("total_trees", pa.int64()),
+            ("expected_survivors", pa.float64()),
+            ("total_co2_kg", pa.float64()),
+            ("co2_per_tree_kg", pa.float64()),
+            ("error", pa.string()),
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows):
+        columns = list(zip(*rows))
+        columns[0] = [str(plan_id) for plan_id in columns[0]]
+        self._writer.write_table(self._pa.Table.from_arrays(
+            [self._pa.array(col, type=field.type) for col, field in zip(columns, self._schema)],
+            schema=self._schema,
+        ))
+
+    def close(self):
+        self._writer.close()
+
+
+def open_sink(path, fmt=None):
+    fmt = fmt or ("parquet" if path.endswith((".parquet", ".pq")) else "csv")
+    return ParquetSink(path) if fmt == "parquet" else CsvSink(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score planting plans without the dashboard.")
+    parser.add_argument("plans", help="JSON-lines file of plans ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file ('-' for stdout, CSV only)")
+    parser.add_argument("--format", choices=["csv", "parquet"], help="defaults to the output extension")
+    parser.add_argument("--catalog", default=DEFAULT_CATALOG, help="species catalog JSON")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="plans per worker task")
+    parser.add_argument("--horizon", type=int, default=None,
+                        help=f"projection horizon in years, up to {MAX_HORIZON} (default: 20)")
+    args = parser.parse_args(argv)
+
+    if args.format == "parquet" and args.output == "-":
+        parser.error("Parquet output needs an output file")
+    if args.horizon is not None and not 1 <= args.horizon <= MAX_HORIZON:
+        parser.error(f"--horizon must be between 1 and {MAX_HORIZON}")
+
+    sink = open_sink(args.output, args.format)
+    scored = failed = 0
+    try:
+        plans = read_plans(args.plans)
+        for rows in score_plans(plans, args.catalog, args.workers, args.chunk_size, args.horizon):
+            sink.write(rows)
+            scored += len(rows)
+            failed += sum(1 for row in rows if row[-1] is not None)
+    finally:
+        sink.close()
+
+    print(f"Scored {scored:,} plans ({failed:,} rejected)", file=sys.stderr)
+    return 1 if failed and failed == scored else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Local load test for api.py: keep-alive clients posting random plans.
+
+    python api.py --port 8080 --workers 4 &
+    python -m benchmarks.load_api --port 8080 --clients 64 --duration 10 --distinct 500
+
+``--distinct`` bounds how many different plans are sent, which sets the result
+cache hit rate; 0 sends a new plan on every request.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+import urllib.request
+
+
+def random_plan(rng, names, max_species=8):
+    chosen = rng.sample(names, rng.randint(1, min(max_species, len(names))))
+    return {name: rng.randint(1, 10_000) for name in chosen}
+
+
+def _request(host, port, body):
+    return (
+        f"POST /v1/project HTTP/1.1\r\nHost: {host}:{port}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    ).encode("latin-1") + body
+
+
+async def _read_response(reader):
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(host, port, bodies, names, deadline, latencies, errors, rng):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            if bodies:
+                body = bodies[rng.randrange(len(bodies))]
+            else:
+                body = json.dumps({"plan": random_plan(rng, names)}).encode()
+            start = time.perf_counter()
+            writer.write(_request(host, port, body))
+            status = await _read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run(host, port, clients, duration, bodies, names, seed):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, bodies, names, deadline, latencies, errors, random.Random(seed + i))
+        for i in range(clients)
+    ))
+    return latencies, errors, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the projection API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--clients", type=int, default=64, help="concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--distinct", type=int, default=500, help="distinct plans to send (0 = all new)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with urllib.request.urlopen(f"http://{args.host}:{args.port}/v1/species") as response:
+        names = json.load(response)["species"]
+    rng = random.Random(args.seed)
+    bodies = [json.dumps({"plan": random_plan(rng, names)}).encode() for _ in range(args.distinct)]
+
+    latencies, errors, elapsed = asyncio.run(run(args.host, args.port, args.clients, args.duration, bodies, names, args.seed))
+    if not latencies:
+        print("No requests completed", file=sys.stderr)
+        return 1
+
+    ms = sorted(latency * 1000.0 for latency in latencies)
+    print(f"{len(ms):,} requests in {elapsed:.1f}s: {len(ms) / elapsed:,.0f} req/s, {len(errors):,} errors")
+    print(f"latency ms: p50 {statistics.median(ms):.2f}  p95 {ms[int(0.95 * (len(ms) - 1))]:.2f}  "
+          f"p99 {ms[int(0.99 * (len(ms) - 1))]:.2f}  max {ms[-1]:.2f}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
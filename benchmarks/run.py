@@ -0,0 +1,190 @@
+"""Headless benchmarks of the dashboard's per-rerun stages on synthetic catalogs.
+
+Each stage of App.main() is timed on its own: catalog validation and matrix
+build, plan aggregation (full, and incremental after one changed count), each
+of the four Plotly figures, the species details table and the CSV export.
+Results are written as JSON and can be compared with an earlier run to flag
+regressions::
+
+    python -m benchmarks.run -o bench.json
+    python -m benchmarks.run --sizes 35 1000 --compare bench.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import charts
+from catalog import Catalog, validate_species
+from projection import IncrementalProjection, normalize_plan, project
+from benchmarks.synthetic import generate_catalog
+
+
+SIZES = (35, 1_000, 10_000)
+FIGURES = ("line", "bar", "pie", "cumulative")
+
+
+def timed(func, repeat, warmup=1):
+    """Run ``func`` ``repeat`` times after ``warmup`` untimed calls; return its last result and the wall times in ms."""
+    for _ in range(warmup):
+        func()
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append((time.perf_counter() - start) * 1000.0)
+    return result, times
+
+
+def _record(results, size, horizon, stage, times, **extra):
+    results.append({
+        "species": size,
+        "horizon": horizon,
+        "stage": stage,
+        "median_ms": statistics.median(times),
+        "min_ms": min(times),
+        "runs": len(times),
+        **extra,
+    })
+
+
+def bench_catalog(size, horizon, repeat, options, trees=100, seed=0):
+    """Time every stage for a plan planting ``trees`` of each species in a synthetic catalog."""
+    payload = generate_catalog(size, seed)
+    results = []
+
+    def load():
+        return Catalog.from_records("<synthetic>", f"synthetic-{size}-{seed}", validate_species(payload))
+
+    catalog, times = timed(load, repeat)
+    _record(results, size, horizon, "catalog", times)
+
+    matrix = catalog.matrix
+    plan = dict(normalize_plan(matrix, {name: trees for name in catalog.names}))
+    projection, times = timed(lambda: project(matrix, plan, horizon), repeat)
+    _record(results, size, horizon, "aggregation", times)
+
+    aggregate = IncrementalProjection(matrix, horizon)
+    aggregate.update(plan)
+    changed = catalog.names[0]
+
+    def update_one():
+        plan[changed] += 1
+        aggregate.update(plan)
+
+    _, times = timed(update_one, repeat)
+    _record(results, size, horizon, "incremental_update", times)
+
+    for kind in FIGURES:
+        (_, payload_bytes), times = timed(lambda: charts.build_figure(kind, projection, options=options), repeat)
+        _record(results, size, horizon, f"figure_{kind}", times, bytes=payload_bytes)
+
+    _, times = timed(lambda: charts.details_frame(projection), repeat)
+    _record(results, size, horizon, "details_frame", times)
+
+    csv, times = timed(lambda: charts.export_frame(projection).to_csv(index=False), repeat)
+    _record(results, size, horizon, "to_csv", times, bytes=len(csv.encode("utf-8")))
+
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes=SIZES, horizons=(None,), repeat=3, options=charts.RenderOptions()):
+    results = []
+    for size in sizes:
+        for horizon in horizons:
+            results.extend(bench_catalog(size, horizon, repeat, options))
+            print(f"  {size:,} species, horizon {horizon or 'default'} done", file=sys.stderr)
+    return {
+        "commit": _git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "render_options": vars(options) if options else None,
+        "results": results,
+    }
+
+
+def _key(row):
+    return row["species"], row["horizon"], row["stage"]
+
+
+def compare(current, baseline, threshold=1.25, floor_ms=1.0):
+    """Rows whose median time grew by more than ``threshold``× against ``baseline``.
+
+    Stages faster than ``floor_ms`` in both runs are ignored as timer noise.
+    """
+    previous = {_key(row): row for row in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        before = previous.get(_key(row))
+        if before is None or max(row["median_ms"], before["median_ms"]) < floor_ms:
+            continue
+        ratio = row["median_ms"] / max(before["median_ms"], 1e-9)
+        if ratio > threshold:
+            regressions.append((row, before, ratio))
+    return regressions
+
+
+def print_table(report, file=sys.stdout):
+    print(f"{'species':>8} {'horizon':>7} {'stage':<18} {'median ms':>10} {'min ms':>10} {'bytes':>12}", file=file)
+    for row in report["results"]:
+        size = f"{row['bytes']:,}" if "bytes" in row else ""
+        print(f"{row['species']:>8,} {row['horizon'] or '-':>7} {row['stage']:<18} "
+              f"{row['median_ms']:>10.2f} {row['min_ms']:>10.2f} {size:>12}", file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard's stages on synthetic catalogs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="catalog sizes in species")
+    parser.add_argument("--horizons", type=int, nargs="+", default=[None],
+                        help="projection horizons in years (default: the catalog's 20)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage")
+    parser.add_argument("--full-figures", action="store_true",
+                        help="build every series without WebGL, grouping or payload budget")
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    parser.add_argument("--compare", help="earlier results JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio reported as a regression (default: 1.25)")
+    args = parser.parse_args(argv)
+
+    options = (charts.RenderOptions(webgl_threshold=sys.maxsize, max_series=0, budget_bytes=0)
+               if args.full_figures else charts.RenderOptions())
+    report = run(args.sizes, args.horizons, args.repeat, options)
+    print_table(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for row, before, ratio in regressions:
+            print(f"REGRESSION {row['species']:,} species, horizon {row['horizon'] or '-'}, "
+                  f"{row['stage']}: {before['median_ms']:.2f} -> {row['median_ms']:.2f} ms "
+                  f"({ratio:.2f}x)", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions against {baseline.get('commit') or args.compare}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""Cold-start report: module import, first script run and catalog load times in fresh processes.
+
+Every measurement runs in a new interpreter so nothing is already imported or
+cached in memory::
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 9 -o startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic import generate_catalog
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PROBE = """
+import time
+start = time.perf_counter()
+{imports}
+print((time.perf_counter() - start) * 1000.0)
+"""
+
+# Runs App.py once the way a new session does, with Streamlit's AppTest; the
+# clock starts after streamlit itself is imported.
+SCRIPT_PROBE = """
+from streamlit.testing.v1 import AppTest
+import time
+app = AppTest.from_file("App.py", default_timeout=300)
+app.session_state["selected_species"] = {selection}
+start = time.perf_counter()
+app.run()
+elapsed = (time.perf_counter() - start) * 1000.0
+assert not app.exception, app.exception
+print(elapsed)
+"""
+
+# Keep probe runs out of the rerun timing log and metrics file.
+SCRIPT_ENV = {"AFFORESTATION_TIMING_LOG": "", "AFFORESTATION_METRICS_FILE": ""}
+
+CATALOG_PROBE = """
+import time
+import catalog
+start = time.perf_counter()
+catalog.load_catalog({path!r}).matrix
+print((time.perf_counter() - start) * 1000.0)
+"""
+
+# What App.py imported at module level before pandas and plotly were deferred.
+EAGER_IMPORTS = "import streamlit, plotly.express, plotly.graph_objects, plotly.subplots, pandas, charts, export, App"
+
+
+def probe(code, runs, env=None):
+    """Median of ``runs`` wall times (ms) printed by ``code``, each in a fresh interpreter."""
+    times = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env={**os.environ, **(env or {})},
+                             capture_output=True, text=True, check=True)
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+def import_report(runs):
+    return {
+        "import streamlit": probe(IMPORT_PROBE.format(imports="import streamlit"), runs),
+        "import App (eager pandas/plotly)": probe(IMPORT_PROBE.format(imports=EAGER_IMPORTS), runs),
+        "import App (lazy)": probe(IMPORT_PROBE.format(imports="import streamlit, App"), runs),
+    }
+
+
+def script_report(runs):
+    """First run of App.py in a fresh process, with no species selected and with the default three."""
+    from catalog import load_catalog
+
+    default = load_catalog().names[:3]
+    return {
+        "first run, no selection": probe(SCRIPT_PROBE.format(selection=[]), runs, SCRIPT_ENV),
+        "first run, default selection": probe(SCRIPT_PROBE.format(selection=default), runs, SCRIPT_ENV),
+    }
+
+
+def catalog_report(sizes, runs):
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = os.path.join(tmp, "cache")
+        for size in sizes:
+            path = os.path.join(tmp, f"synthetic-species-{size}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(generate_catalog(size), f)
+            code = CATALOG_PROBE.format(path=path)
+            report[f"{size:,} species, JSON"] = probe(code, runs, {"AFFORESTATION_CACHE_DIR": ""})
+            probe(code, 1, {"AFFORESTATION_CACHE_DIR": cache_dir})
+            report[f"{size:,} species, compiled .npz"] = probe(code, runs, {"AFFORESTATION_CACHE_DIR": cache_dir})
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold-start import and catalog load times.")
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per measurement")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[35, 1_000, 10_000],
+                        help="synthetic catalog sizes in species")
+    parser.add_argument("-o", "--output", help="write the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = {
+        "imports": import_report(args.runs),
+        "script": script_report(args.runs),
+        "catalog": catalog_report(args.sizes, args.runs),
+    }
+    for section, rows in report.items():
+        print(f"{section}:")
+        for label, ms in rows.items():
+            print(f"  {label:<36} {ms:>9.1f} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""Synthetic species catalogs in the dataset/tree-species.json schema.
+
+    python -m benchmarks.synthetic 10000 -o /tmp/tree-species-10k.json
+"""
+
+import argparse
+import json
+
+import numpy as np
+
+from growth import annual_rates, model_curves
+
+
+def generate_catalog(n_species, seed=0, years=20):
+    """A ``{"species": {...}}`` payload with ``n_species`` plausible random species."""
+    rng = np.random.default_rng(seed)
+    biomass = rng.integers(30, 121, n_species).astype(float)
+    carbon = rng.choice([0.45, 0.47, 0.5, 0.52], n_species)
+    conversion = np.full(n_species, 3.67)
+    survival = rng.choice([0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9], n_species)
+    lifespan = rng.choice([15, 20, 25, 30, 35, 40, 50, 60], n_species).astype(float)
+    curves = np.round(
+        model_curves(annual_rates(biomass, carbon, conversion, survival), lifespan, 1, years), 2
+    )
+
+    width = len(str(n_species))
+    return {
+        "species": {
+            f"Synthetic Species {i + 1:0{width}d}": {
+                "Avg_Biomass_kg_per_year": int(biomass[i]),
+                "Carbon_Content_Ratio": float(carbon[i]),
+                "CO2_Conversion_Factor": float(conversion[i]),
+                "Survival_Rate": float(survival[i]),
+                "Lifespan_Years": int(lifespan[i]),
+                "CO2_Sequestration_20yrs": curves[i].tolist(),
+            }
+            for i in range(n_species)
+        }
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic species catalog.")
+    parser.add_argument("species", type=int, help="number of species")
+    parser.add_argument("-o", "--output", required=True, help="output JSON file")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(generate_catalog(args.species, args.seed), f)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""Tree species catalog loading, validation and caching.
+
+A validated catalog is also compiled to an ``.npz`` file of its arrays under
+``CACHE_DIR``, named by the JSON file's content hash, so other processes (and
+restarts) load the arrays directly instead of parsing and validating the JSON
+again. ``python catalog.py`` precompiles every catalog in the dataset directory.
+
+Loaded catalogs keep only the arrays: metadata as one column per field, and
+the CO₂ curves interned so species with identical curves share one row (see
+:class:`projection.CurveTable`). The JSON records are rebuilt on request.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+
+import numpy as np
+
+from projection import CurveTable, SpeciesMatrix
+
+
+DATASET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dataset")
+DEFAULT_CATALOG = os.path.join(DATASET_DIR, "tree-species.json")
+CACHE_DIR = os.environ.get("AFFORESTATION_CACHE_DIR", os.path.join(DATASET_DIR, ".cache"))
+COMPILED_FORMAT = 3
+
+NUMERIC_FIELDS = (
+    "Avg_Biomass_kg_per_year",
+    "Carbon_Content_Ratio",
+    "CO2_Conversion_Factor",
+    "Survival_Rate",
+    "Lifespan_Years",
+)
+CURVE_FIELD = "CO2_Sequestration_20yrs"
+COST_FIELD = "Cost_Per_Tree"
+SURVIVAL_CURVE_FIELD = "Survival_Curve"
+
+
+class CatalogError(ValueError):
+    pass
+
+
+class Catalog:
+    """A species catalog built from validated JSON records or from compiled arrays."""
+
+    def __init__(self, path, version, species=None, matrix=None, costs=None):
+        self.path = path
+        self.version = version
+        self._species = species
+        self._matrix = matrix
+        self._costs = costs
+
+    @classmethod
+    def from_records(cls, path, version, species):
+        """A catalog holding the arrays of validated ``species`` records, not the records themselves."""
+        costs = np.array([record.get(COST_FIELD, np.nan) for record in species.values()], dtype=np.float64)
+        return cls(path, version, matrix=SpeciesMatrix.from_tree_data(species), costs=costs)
+
+    @property
+    def name(self):
+        return os.path.splitext(os.path.basename(self.path))[0]
+
+    @property
+    def species(self):
+        """Species records as in the JSON file (rebuilt from the arrays for a compiled catalog)."""
+        if self._species is None:
+            self._species = _records(self.matrix, self.cost_array)
+        return self._species
+
+    @property
+    def names(self):
+        return list(self.matrix.names)
+
+    @property
+    def cost_array(self):
+        """Cost_Per_Tree by species, NaN where the catalog gives none."""
+        if self._costs is None:
+            self._costs = np.array([record.get(COST_FIELD, np.nan) for record in self._species.values()],
+                                   dtype=np.float64)
+        return self._costs
+
+    def costs(self):
+        return np.nan_to_num(self.cost_array).tolist()
+
+    @property
+    def matrix(self):
+        if self._matrix is None:
+            self._matrix = SpeciesMatrix.from_tree_data(self._species)
+        return self._matrix
+
+    def __len__(self):
+        return len(self.matrix)
+
+    def __contains__(self, name):
+        return name in self.matrix.index
+
+    def __getitem__(self, name):
+        return self.species[name]
+
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def validate_species(payload):
+    """Check the ``{"species": {...}}`` schema and return the species mapping."""
+    if not isinstance(payload, dict) or not isinstance(payload.get("species"), dict):
+        raise CatalogError("catalog must be an object with a 'species' mapping")
+
+    species = payload["species"]
+    if not species:
+        raise CatalogError("catalog has no species")
+
+    errors = []
+    curve_length = None
+    for name, record in species.items():
+        if not isinstance(record, dict):
+            errors.append(f"{name}: record must be an object")
+            continue
+
+        for field in NUMERIC_FIELDS:
+            if field not in record:
+                errors.append(f"{name}: missing {field}")
+            elif not _is_number(record[field]):
+                errors.append(f"{name}: {field} must be a number")
+
+        survival = record.get("Survival_Rate")
+        if _is_number(survival) and not 0 <= survival <= 1:
+            errors.append(f"{name}: Survival_Rate must be between 0 and 1")
+        lifespan = record.get("Lifespan_Years")
+        if _is_number(lifespan) and lifespan <= 0:
+            errors.append(f"{name}: Lifespan_Years must be positive")
+
+        cost = record.get(COST_FIELD)
+        if cost is not None and (not _is_number(cost) or cost < 0):
+            errors.append(f"{name}: {COST_FIELD} must be a non-negative number")
+
+        survival_curve = record.get(SURVIVAL_CURVE_FIELD)
+        if survival_curve is not None and (
+            not isinstance(survival_curve, list) or not survival_curve
+            or not all(_is_number(v) and 0 <= v <= 1 for v in survival_curve)
+            or any(later > earlier for earlier, later in zip(survival_curve, survival_curve[1:]))
+        ):
+            errors.append(f"{name}: {SURVIVAL_CURVE_FIELD} must be a non-empty, non-increasing list "
+                          "of fractions between 0 and 1")
+
+        curve = record.get(CURVE_FIELD)
+        if not isinstance(curve, list) or not curve or not all(_is_number(v) for v in curve):
+            errors.append(f"{name}: {CURVE_FIELD} must be a non-empty list of numbers")
+        elif curve_length is None:
+            curve_length = len(curve)
+        elif len(curve) != curve_length:
+            errors.append(f"{name}: {CURVE_FIELD} has {len(curve)} values, expected {curve_length}")
+
+    if errors:
+        more = f" (and {len(errors) - 10} more)" if len(errors) > 10 else ""
+        raise CatalogError("invalid catalog: " + "; ".join(errors[:10]) + more)
+
+    return species
+
+
+def load_cached(path, build):
+    """Build ``path`` with ``build(path, raw_bytes, version)``, reusing the result until the file's mtime and hash change."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    with _lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        with open(path, "rb") as f:
+            raw = f.read()
+        version = hashlib.sha256(raw).hexdigest()
+
+        if cached is not None and cached[1].version == version:
+            loaded = cached[1]
+        else:
+            loaded = build(path, raw, version)
+
+        _cache[path] = (stamp, loaded)
+        return loaded
+
+
+def parse_json(path, raw):
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise CatalogError(f"{os.path.basename(path)} is not valid JSON: {e}") from e
+
+
+def _number(value):
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def _records(matrix, costs):
+    records = {}
+    curves = matrix.curves
+    for i, name in enumerate(matrix.names):
+        record = {
+            "Avg_Biomass_kg_per_year": _number(matrix.biomass[i]),
+            "Carbon_Content_Ratio": _number(matrix.carbon[i]),
+            "CO2_Conversion_Factor": _number(matrix.conversion[i]),
+            "Survival_Rate": _number(matrix.survival[i]),
+            "Lifespan_Years": _number(matrix.lifespan[i]),
+            CURVE_FIELD: [_number(v) for v in curves[i]],
+        }
+        if not np.isnan(costs[i]):
+            record[COST_FIELD] = _number(costs[i])
+        if matrix.attrition.shape[1] and not np.isnan(matrix.attrition[i, 0]):
+            record[SURVIVAL_CURVE_FIELD] = [_number(v) for v in matrix.attrition[i]]
+        records[name] = record
+    return records
+
+
+def compiled_path(path, version, cache_dir=CACHE_DIR):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f"{name}.{version[:16]}.v{COMPILED_FORMAT}.npz")
+
+
+def save_compiled(catalog, target):
+    """Write the catalog's arrays to ``target`` atomically and drop older compilations of it."""
+    matrix = catalog.matrix
+    directory = os.path.dirname(target)
+    tmp = None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(
+                f,
+                format=COMPILED_FORMAT,
+                names=np.array(matrix.names, dtype=str),
+                survival=matrix.survival,
+                lifespan=matrix.lifespan,
+                curve_ids=matrix.table.ids,
+                curve_table=matrix.table.curves,
+                biomass=matrix.biomass,
+                carbon=matrix.carbon,
+                conversion=matrix.conversion,
+                attrition=matrix.attrition,
+                costs=catalog.cost_array,
+            )
+        os.replace(tmp, target)
+    except OSError:
+        if tmp is not None and os.path.exists(tmp):
+            os.remove(tmp)
+        return False
+
+    # Names may contain dots ("tree-species.kerala"), so compare the whole name in
+    # front of ".<version>.v<format>.npz" rather than a glob prefix.
+    name = os.path.basename(target).rsplit(".", 3)[0]
+    for stale in glob.glob(os.path.join(directory, f"{glob.escape(name)}.*.npz")):
+        if stale != target and os.path.basename(stale).rsplit(".", 3)[0] == name:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    return True
+
+
+def load_compiled(path, version, target):
+    with np.load(target, allow_pickle=False) as data:
+        if int(data["format"]) != COMPILED_FORMAT:
+            raise ValueError(f"{target} has compiled format {int(data['format'])}")
+        matrix = SpeciesMatrix(
+            data["names"].tolist(),
+            data["survival"],
+            data["lifespan"],
+            CurveTable.intern(data["curve_table"], data["curve_ids"]),
+            data["biomass"],
+            data["carbon"],
+            data["conversion"],
+            data["attrition"],
+        )
+        costs = data["costs"]
+    return Catalog(path, version, matrix=matrix, costs=costs)
+
+
+def _build_catalog(path, raw, version):
+    target = compiled_path(path, version) if CACHE_DIR else None
+    if target and os.path.exists(target):
+        try:
+            return load_compiled(path, version, target)
+        except (OSError, ValueError, KeyError):
+            pass
+
+    catalog = Catalog.from_records(path, version, validate_species(parse_json(path, raw)))
+    if target:
+        save_compiled(catalog, target)
+    return catalog
+
+
+def load_catalog(path=DEFAULT_CATALOG):
+    """Load a catalog, reusing the parsed result until the file's mtime and hash change."""
+    return load_cached(path, _build_catalog)
+
+
+def list_catalogs(directory=DATASET_DIR):
+    """Catalog files kept in the dataset directory, default catalog first."""
+    paths = sorted(glob.glob(os.path.join(directory, "*species*.json")))
+    default = os.path.abspath(DEFAULT_CATALOG)
+    return sorted(paths, key=lambda p: os.path.abspath(p) != default)
+
+
+if __name__ == "__main__":
+    for catalog_path in sys.argv[1:] or list_catalogs():
+        catalog = load_catalog(catalog_path)
+        print(f"{catalog_path}: {len(catalog):,} species -> {compiled_path(catalog.path, catalog.version)}")
@@ -0,0 +1,475 @@
+"""Plotly figures and tables for a plan's projection."""
+
+import json
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from projection import Projection
+
+
+COLORS = px.colors.qualitative.Set3
+
+
+@dataclass(frozen=True)
+class RenderOptions:
+    webgl_threshold: int = 20
+    max_series: int = 15
+    budget_bytes: int = 1_000_000
+
+
+def figure_size(fig):
+    """Serialized JSON size of a figure in bytes, as shipped to the browser."""
+    return len(fig.to_json().encode("utf-8"))
+
+
+class SerializedFigure(go.Figure):
+    """A figure held as its plotly JSON.
+
+    ``st.plotly_chart`` and ``to_html`` read a figure only through ``to_dict``, so
+    answering that from the JSON skips copying and validating every trace again.
+    """
+
+    def __init__(self, spec):
+        super().__init__()
+        self._spec = spec
+
+    def to_dict(self):
+        return json.loads(self._spec)
+
+
+def collapse_tail(projection, max_series):
+    """Keep the ``max_series - 1`` largest species and fold the rest into one "Other" row."""
+    if not max_series or len(projection.species) <= max_series:
+        return projection
+
+    order = np.argsort(-projection.totals, kind="stable")
+    head = np.sort(order[:max(max_series - 1, 1)])
+    tail = np.setdiff1d(order, head)
+
+    def fold(values):
+        return np.concatenate([values[head], values[tail].sum(axis=0, keepdims=True)])
+
+    counts = fold(projection.counts)
+    survivors = fold(projection.survivors)
+    totals = fold(projection.totals)
+    return Projection(
+        species=[projection.species[i] for i in head] + [f"Other ({len(tail)} species)"],
+        years=projection.years,
+        counts=counts,
+        survival=survivors / counts,
+        lifespan=np.append(projection.lifespan[head], np.nan),
+        survivors=survivors,
+        annual=fold(projection.annual),
+        cumulative=fold(projection.cumulative),
+        totals=totals,
+        per_tree=totals / counts,
+    )
+
+
+def _values(values, compact):
+    """Chart values, rounded to whole kg and narrowed to int32 where they fit when compact."""
+    if not compact:
+        return values
+    values = np.rint(values)
+    if np.abs(values).max(initial=0) < 2**31:
+        return values.astype(np.int32)
+    return values.astype(np.int64)
+
+
+def band_color(color, alpha=0.2):
+    return color.replace("rgb(", "rgba(").replace(")", f",{alpha})")
+
+
+def line_figure(projection, bands=None, webgl=False, compact=False):
+    years = projection.years
+    line_fig = go.Figure()
+    scatter = go.Scattergl if webgl else go.Scatter
+    traces = []
+
+    if bands:
+        annual_bands = bands.annual
+        for i, species in enumerate(projection.species):
+            for percentile, fill in ((95, None), (5, 'tonexty')):
+                traces.append(scatter(
+                    x=years,
+                    y=_values(annual_bands[bands.band(percentile), i], compact),
+                    mode='lines',
+                    line=dict(width=0),
+                    fill=fill,
+                    fillcolor=band_color(COLORS[i % len(COLORS)]),
+                    legendgroup=species,
+                    showlegend=False,
+                    hoverinfo='skip'
+                ))
+
+    for i, species in enumerate(projection.species):
+        line = dict(color=COLORS[i % len(COLORS)], width=3)
+        if not webgl:
+            line.update(shape='spline', smoothing=0.3)
+
+        traces.append(scatter(
+            x=years,
+            y=_values(projection.annual[i], compact),
+            legendgroup=species,
+            mode='lines',
+            name=species,
+            line=line,
+            hovertemplate=f"<b>{species}</b><br>" +
+                         "Year: %{x}<br>" +
+                         "CO₂ Captured: %{y:,.0f} kg<extra></extra>"
+        ))
+
+    line_fig.add_traces(traces)
+    line_fig.update_layout(
+        title="",
+        xaxis_title="Year",
+        yaxis_title="CO₂ Captured (kg)",
+        hovermode='x unified',
+        height=500,
+        showlegend=True,
+        template="plotly_white"
+    )
+    return line_fig
+
+
+def bar_figure(projection, compact=False):
+    totals = _values(projection.totals, compact)
+
+    bar_fig = px.bar(
+        x=projection.species,
+        y=totals,
+        color=totals,
+        color_continuous_scale="Viridis"
+    )
+
+    bar_fig.update_layout(
+        xaxis_title="Tree Species",
+        yaxis_title="Total CO₂ Captured (kg)",
+        showlegend=False,
+        height=400,
+        template="plotly_white"
+    )
+
+    bar_fig.update_xaxes(tickangle=45)
+    return bar_fig
+
+
+def pie_figure(projection, compact=False):
+    pie_fig = px.pie(
+        values=_values(projection.totals, compact),
+        names=projection.species,
+        hole=0.4,
+        color_discrete_sequence=COLORS
+    )
+
+    pie_fig.update_traces(
+        hovertemplate="<b>%{label}</b><br>" +
+                     "CO₂: %{value:,.0f} kg<br>" +
+                     "Percentage: %{percent}<extra></extra>"
+    )
+
+    pie_fig.update_layout(
+        height=400,
+        showlegend=True,
+        template="plotly_white"
+    )
+    return pie_fig
+
+
+def cumulative_figure(projection, bands=None, webgl=False, compact=False):
+    years = projection.years
+    cumulative_fig = go.Figure()
+    scatter = go.Scattergl if webgl else go.Scatter
+    traces = []
+
+    for i, species in enumerate(projection.species):
+        traces.append(scatter(
+            x=years,
+            y=_values(projection.cumulative[i], compact),
+            mode='lines',
+            name=species,
+            fill='tonexty' if i > 0 else 'tozeroy',
+            line=dict(width=0.5),
+            fillcolor=COLORS[i % len(COLORS)],
+            hovertemplate=f"<b>{species}</b><br>" +
+                         "Year: %{x}<br>" +
+                         "Cumulative CO₂: %{y:,.0f} kg<extra></extra>"
+        ))
+
+    if bands:
+        for percentile in (5, 95):
+            traces.append(scatter(
+                x=years,
+                y=_values(bands.cumulative_total[bands.band(percentile)], compact),
+                mode='lines',
+                name=f"Total ({percentile}th percentile)",
+                line=dict(color="black", width=1.5, dash='dash'),
+                hovertemplate="Year: %{x}<br>" +
+                             f"{percentile}th percentile: " +
+                             "%{y:,.0f} kg<extra></extra>"
+            ))
+
+    cumulative_fig.add_traces(traces)
+    cumulative_fig.update_layout(
+        title="",
+        xaxis_title="Year",
+        yaxis_title="Cumulative CO₂ Captured (kg)",
+        hovermode='x unified',
+        height=500,
+        template="plotly_white"
+    )
+    return cumulative_fig
+
+
+def details_columns(horizon):
+    return ["Species", "Trees Planted", "Survival Rate", "Expected Survivors", "Lifespan (years)",
+            f"Total CO₂ ({horizon} years)", "CO₂ per Tree"]
+
+
+def details_row(species, count, survival, survivors, lifespan, total):
+    """One formatted row of the species details table."""
+    per_tree = total / count if count > 0 else 0.0
+    return (species, int(count), f"{survival:.0%}", f"{survivors:.0f}", int(lifespan),
+            f"{total:,.0f} kg", f"{per_tree:,.0f} kg")
+
+
+def details_table(rows, horizon):
+    return pd.DataFrame.from_records(list(rows), columns=details_columns(horizon))
+
+
+def details_frame(projection):
+    rows = map(details_row, projection.species, projection.counts.tolist(), projection.survival.tolist(),
+               projection.survivors.tolist(), projection.lifespan.tolist(), projection.totals.tolist())
+    return details_table(rows, len(projection.years))
+
+
+
+def _build(kind, projection, bands, webgl, compact):
+    if kind == "line":
+        return line_figure(projection, bands, webgl=webgl, compact=compact)
+    if kind == "bar":
+        return bar_figure(projection, compact=compact)
+    if kind == "pie":
+        return pie_figure(projection, compact=compact)
+    return cumulative_figure(projection, bands, webgl=webgl, compact=compact)
+
+
+# Generous JSON sizes of a figure's layout, of each trace and of each number in it.
+# A figure whose bound from these stays within budget is built without probes.
+BASE_BYTES = 16_384
+SERIES_BYTES = 1_024
+VALUE_BYTES = 25
+
+
+def _upper_bound(kind, projection, bands, series):
+    """A cheap overestimate of a figure's serialized size with ``series`` series."""
+    if kind in ("bar", "pie"):
+        return BASE_BYTES + series * (SERIES_BYTES + VALUE_BYTES)
+    years = len(projection.years)
+    # Bands add an upper and a lower line: per species on the line chart, for the total otherwise.
+    per_series = 3 * years if bands is not None and kind == "line" else years
+    band_total = 2 * years if bands is not None and kind != "line" else 0
+    return BASE_BYTES + (band_total + years) * VALUE_BYTES + series * (SERIES_BYTES + per_series * VALUE_BYTES)
+
+
+def _estimate_size(kind, projection, webgl, compact):
+    """Predict the serialized size of the full figure from two small probe builds."""
+    sizes = []
+    for series in (2, 6):
+        view = collapse_tail(projection, series)
+        sizes.append((len(view.species), figure_size(_build(kind, view, None, webgl, compact))))
+    (n1, s1), (n2, s2) = sizes
+    per_series = (s2 - s1) / (n2 - n1) if n2 > n1 else 0.0
+    return s1 - n1 * per_series, per_series
+
+
+def build_figure(kind, projection, bands=None, options=RenderOptions()):
+    """Build a figure within the payload budget and return it with its serialized size.
+
+    Above ``webgl_threshold`` series the line and cumulative charts switch to WebGL
+    traces, and species beyond ``max_series`` are grouped into "Other". For selections
+    large enough to exceed the budget, values are compacted to whole kg and the series
+    count is cut to what the budget allows, estimated from two small probe figures so
+    the oversized figure is never built.
+    """
+    n = len(projection.species)
+    max_series = min(options.max_series or n, n)
+    compact = False
+
+    # Probing only pays off when more series are drawn than the probes build and
+    # the figure could plausibly go over budget.
+    if options.budget_bytes and max_series > 6 \
+            and _upper_bound(kind, projection, bands, max_series) > options.budget_bytes:
+        webgl = max_series > options.webgl_threshold
+        base, per_series = _estimate_size(kind, projection, webgl, compact)
+        if base + per_series * max_series > options.budget_bytes:
+            compact = True
+            base, per_series = _estimate_size(kind, projection, webgl, compact)
+            if per_series > 0:
+                # Keep 10% headroom: longer names and colors past the probe make
+                # later series slightly larger than the probed ones.
+                fits = int(0.9 * (options.budget_bytes - base) / per_series)
+                max_series = max(2, min(max_series, fits))
+
+    while True:
+        view = collapse_tail(projection, max_series)
+        # Per-species bands only line up with an uncollapsed view; total bands always do.
+        view_bands = bands if kind == "cumulative" or view is projection else None
+        fig = _build(kind, view, view_bands, len(view.species) > options.webgl_threshold, compact)
+        size = figure_size(fig)
+
+        if not options.budget_bytes or size <= options.budget_bytes:
+            return fig, size
+        if not compact:
+            compact = True
+        elif len(view.species) > 2:
+            max_series = len(view.species) // 2
+        else:
+            return fig, size
+
+
+BASELINE_REGION = "Baseline (catalog)"
+
+
+def summary_frame(projection):
+    """Per-species totals as typed numeric columns, for export."""
+    horizon = len(projection.years)
+    return pd.DataFrame({
+        "species": projection.species,
+        "trees_planted": projection.counts.astype(np.int64),
+        "survival_rate": projection.survival,
+        "expected_survivors": projection.survivors,
+        "lifespan_years": projection.lifespan,
+        "horizon_years": np.full(len(projection.species), horizon, dtype=np.int32),
+        "total_co2_kg": projection.totals,
+        "co2_per_tree_kg": projection.per_tree,
+    })
+
+
+def export_frame(projection, region_projection=None):
+    """Per-species totals for the catalog baseline followed by each compared region."""
+    frames = [summary_frame(projection)]
+    names = [BASELINE_REGION]
+    if region_projection is not None:
+        frames += [summary_frame(region_projection.region(r)) for r in range(len(region_projection.regions))]
+        names += region_projection.regions
+
+    for frame, name in zip(frames, names):
+        frame.insert(0, "region", name)
+    return pd.concat(frames, ignore_index=True)
+
+
+def region_totals_figure(region_projection):
+    totals = region_projection.total_co2
+
+    region_fig = px.bar(
+        x=region_projection.regions,
+        y=totals,
+        color=totals,
+        color_continuous_scale="Viridis"
+    )
+
+    region_fig.update_traces(
+        hovertemplate="<b>%{x}</b><br>" +
+                     "Total CO₂: %{y:,.0f} kg<extra></extra>"
+    )
+
+    region_fig.update_layout(
+        xaxis_title="Region",
+        yaxis_title="Total CO₂ Captured (kg)",
+        showlegend=False,
+        height=400,
+        template="plotly_white"
+    )
+    return region_fig
+
+
+def region_cumulative_figure(region_projection):
+    years = region_projection.years
+    cumulative_total = region_projection.cumulative_total
+    region_fig = go.Figure()
+
+    region_fig.add_traces([
+        go.Scatter(
+            x=years,
+            y=cumulative_total[r],
+            mode='lines',
+            name=region,
+            line=dict(color=COLORS[r % len(COLORS)], width=3),
+            hovertemplate=f"<b>{region}</b><br>" +
+                         "Year: %{x}<br>" +
+                         "Cumulative CO₂: %{y:,.0f} kg<extra></extra>"
+        )
+        for r, region in enumerate(region_projection.regions)
+    ])
+
+    region_fig.update_layout(
+        xaxis_title="Year",
+        yaxis_title="Cumulative CO₂ Captured (kg)",
+        hovermode='x unified',
+        height=400,
+        template="plotly_white"
+    )
+    return region_fig
+
+
+def tornado_figure(rows, baseline, spread, labels):
+    """Horizontal bars of the change in total CO₂ when each parameter moves by ± ``spread``."""
+    names = [labels[name] for name, _, _ in rows][::-1]
+    low = [low_total - baseline for _, low_total, _ in rows][::-1]
+    high = [high_total - baseline for _, _, high_total in rows][::-1]
+    tornado_fig = go.Figure()
+
+    tornado_fig.add_traces([
+        go.Bar(
+            y=names,
+            x=values,
+            orientation='h',
+            name=f"{sign}{spread:.0%}",
+            marker_color=color,
+            hovertemplate="<b>%{y}</b> " + f"{sign}{spread:.0%}" + "<br>" +
+                         "Change: %{x:+,.0f} kg<extra></extra>"
+        )
+        for sign, values, color in (("−", low, "#d62728"), ("+", high, "#2ca02c"))
+    ])
+
+    tornado_fig.update_layout(
+        barmode='overlay',
+        xaxis_title=f"Change in Total CO₂ vs {baseline:,.0f} kg",
+        height=300,
+        template="plotly_white"
+    )
+    return tornado_fig
+
+
+def sensitivity_figure(result, parameters, labels):
+    """Total CO₂ as one parameter moves across the sweep, the others at catalog values."""
+    percent = (result.multipliers - 1.0) * 100
+    sensitivity_fig = go.Figure()
+
+    sensitivity_fig.add_traces([
+        go.Scatter(
+            x=percent,
+            y=result.one_at_a_time(name),
+            mode='lines',
+            name=labels[name],
+            line=dict(color=COLORS[i % len(COLORS)], width=3),
+            hovertemplate=f"<b>{labels[name]}</b><br>" +
+                         "Change: %{x:+.1f}%<br>" +
+                         "Total CO₂: %{y:,.0f} kg<extra></extra>"
+        )
+        for i, name in enumerate(parameters)
+    ])
+
+    sensitivity_fig.update_layout(
+        xaxis_title="Parameter Change (%)",
+        yaxis_title="Total CO₂ Captured (kg)",
+        hovermode='x unified',
+        height=400,
+        template="plotly_white"
+    )
+    return sensitivity_fig
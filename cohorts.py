@@ -0,0 +1,88 @@
+"""Staggered planting schedules projected as cohorts with per-age survival.
+
+A schedule gives each species a tree count per planting year. A tree planted in
+year ``p`` contributes, in year ``t``, the catalog's per-tree value for age
+``t - p + 1`` weighted by the fraction of its cohort still alive at that age, so
+each species' annual series is the convolution of its schedule with its
+survival-weighted curve. The convolution runs over all species at once: directly
+for a few planting years, through a real FFT for long programs of annual cohorts.
+"""
+
+import numpy as np
+
+from projection import Projection
+
+
+FFT_MIN_COHORTS = 12
+
+
+def repeat_schedule(plan, rounds, every=1, start=1):
+    """``{species: counts by planting year}`` planting ``plan`` ``rounds`` times, ``every`` years apart."""
+    years = [start + k * every for k in range(rounds)]
+    length = years[-1]
+    schedule = {}
+    for name, count in plan.items():
+        counts = [0] * length
+        for year in years:
+            counts[year - 1] = count
+        schedule[name] = counts
+    return schedule
+
+
+def schedule_array(schedule, horizon):
+    """Counts as species×planting years over ``1..horizon``; later plantings are dropped."""
+    out = np.zeros((len(schedule), horizon))
+    for i, counts in enumerate(schedule.values()):
+        counts = np.asarray(counts, dtype=np.float64)[:horizon]
+        out[i, :len(counts)] = counts
+    return out
+
+
+def convolve_cohorts(planted, weights):
+    """Causal convolution along years of ``planted`` with ``weights``, both species×years.
+
+    Returns the first ``weights.shape[1]`` years. Few cohorts are shifted and added
+    directly (exact); many go through one batched real FFT.
+    """
+    horizon = weights.shape[1]
+    active = np.flatnonzero(planted.any(axis=0))
+    if len(active) < FFT_MIN_COHORTS:
+        out = np.zeros_like(weights)
+        for p in active:
+            out[:, p:] += planted[:, p, None] * weights[:, :horizon - p]
+        return out
+
+    n = 1 << int(np.ceil(np.log2(2 * horizon - 1)))
+    spectrum = np.fft.rfft(planted, n, axis=1) * np.fft.rfft(weights, n, axis=1)
+    # Every term is non-negative, so anything below zero is FFT round-off.
+    return np.maximum(np.fft.irfft(spectrum, n, axis=1)[:, :horizon], 0.0)
+
+
+def project_schedule(matrix, schedule, horizon=None):
+    """Project ``{species: counts by planting year}`` over ``horizon`` years."""
+    species = list(schedule.keys())
+    idx = matrix.indices(species)
+    curves = matrix.curves_for(horizon, idx)
+    horizon = curves.shape[1]
+    alive = matrix.survival_curves_for(horizon)[idx]
+    planted = schedule_array(schedule, horizon)
+
+    annual = convolve_cohorts(planted, alive * curves)
+    cumulative = np.cumsum(annual, axis=1)
+    totals = cumulative[:, -1]
+    counts = planted.sum(axis=1)
+    # A cohort planted in year p is horizon - p + 1 years old at the end.
+    survivors = (planted * alive[:, ::-1]).sum(axis=1)
+
+    return Projection(
+        species=species,
+        years=np.arange(1, horizon + 1),
+        counts=counts,
+        survival=np.divide(survivors, counts, out=np.zeros_like(counts), where=counts > 0),
+        lifespan=matrix.lifespan[idx],
+        survivors=survivors,
+        annual=annual,
+        cumulative=cumulative,
+        totals=totals,
+        per_tree=np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0),
+    )
@@ -0,0 +1,144 @@
+"""Typed long-form export of projections: one row per species and year.
+
+Rows are generated in bounded chunks and encoded incrementally, so a large
+multi-plan or long-horizon export is written out as it is produced instead of
+being assembled in memory first. CSV needs only pandas; Parquet and Arrow IPC
+need pyarrow.
+
+Streamlit's download button only serves bytes held in memory, so the dashboard
+reads the finished spool once; the report bundle writes straight into its ZIP.
+"""
+
+import io
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+
+ROWS_PER_CHUNK = 65_536
+SPOOL_BYTES = 32 * 1024 * 1024
+
+FORMATS = {
+    "csv": ("CSV", "tree_planting_long.csv", "text/csv"),
+    "parquet": ("Parquet", "tree_planting_long.parquet", "application/vnd.apache.parquet"),
+    "arrow": ("Arrow IPC", "tree_planting_long.arrows", "application/vnd.apache.arrow.stream"),
+}
+
+
+def long_frames(projections, rows_per_chunk=ROWS_PER_CHUNK):
+    """Yield long-form DataFrame chunks for ``(labels, projection)`` pairs.
+
+    ``labels`` is a dict of constant columns (e.g. ``{"region": "Western Ghats"}``)
+    placed before the value columns; every pair must use the same label keys.
+    """
+    for labels, projection in projections:
+        n_years = len(projection.years)
+        species_per_chunk = max(1, rows_per_chunk // max(n_years, 1))
+        for start in range(0, len(projection.species), species_per_chunk):
+            stop = min(start + species_per_chunk, len(projection.species))
+            rows = (stop - start) * n_years
+            frame = {name: np.full(rows, value, dtype=object if isinstance(value, str) else None)
+                     for name, value in labels.items()}
+            frame.update({
+                "species": np.repeat(np.array(projection.species[start:stop], dtype=object), n_years),
+                "year": np.tile(projection.years.astype(np.int32), stop - start),
+                "annual_co2_kg": projection.annual[start:stop].ravel(),
+                "cumulative_co2_kg": projection.cumulative[start:stop].ravel(),
+                "survivors": np.repeat(projection.survivors[start:stop], n_years),
+            })
+            yield pd.DataFrame(frame)
+
+
+def region_projections(projection, region_projection=None, baseline="Baseline (catalog)"):
+    """``(labels, projection)`` pairs for the baseline and each compared region."""
+    yield {"region": baseline}, projection
+    if region_projection is not None:
+        for r, name in enumerate(region_projection.regions):
+            yield {"region": name}, region_projection.region(r)
+
+
+class _Drain(io.RawIOBase):
+    """Write-only sink whose buffered bytes are taken out after each chunk."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def take(self):
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def iter_csv(frames):
+    header = True
+    for frame in frames:
+        yield frame.to_csv(index=False, header=header).encode("utf-8")
+        header = False
+
+
+def _iter_arrow_writer(frames, open_writer):
+    import pyarrow as pa
+
+    drain = _Drain()
+    writer = None
+    for frame in frames:
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if writer is None:
+            writer = open_writer(drain, table.schema)
+        writer.write_table(table)
+        yield drain.take()
+    if writer is not None:
+        writer.close()
+        yield drain.take()
+
+
+def iter_parquet(frames):
+    import pyarrow.parquet as pq
+
+    return _iter_arrow_writer(frames, lambda sink, schema: pq.ParquetWriter(sink, schema))
+
+
+def iter_arrow(frames):
+    import pyarrow as pa
+
+    return _iter_arrow_writer(frames, lambda sink, schema: pa.ipc.new_stream(sink, schema))
+
+
+ENCODERS = {"csv": iter_csv, "parquet": iter_parquet, "arrow": iter_arrow}
+
+
+def stream_export(projections, fmt="csv", rows_per_chunk=ROWS_PER_CHUNK):
+    """Yield encoded byte chunks of the long-form table in ``fmt``."""
+    return ENCODERS[fmt](long_frames(projections, rows_per_chunk))
+
+
+def write_export(path_or_file, projections, fmt="csv", rows_per_chunk=ROWS_PER_CHUNK):
+    close = isinstance(path_or_file, str)
+    f = open(path_or_file, "wb") if close else path_or_file
+    try:
+        for chunk in stream_export(projections, fmt, rows_per_chunk):
+            f.write(chunk)
+    finally:
+        if close:
+            f.close()
+
+
+def spool_export(projections, fmt="csv", rows_per_chunk=ROWS_PER_CHUNK):
+    """Stream the export into a temporary file that spills to disk past ``SPOOL_BYTES``."""
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    write_export(spool, projections, fmt, rows_per_chunk)
+    spool.seek(0)
+    return spool
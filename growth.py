@@ -0,0 +1,42 @@
+"""Parametric per-tree sequestration model for horizons beyond the catalog curves.
+
+The catalog's CO2_Sequestration_20yrs values follow
+
+    value(t) = min(t, Lifespan_Years) × Avg_Biomass_kg_per_year
+               × Carbon_Content_Ratio × CO2_Conversion_Factor × Survival_Rate
+
+so the same formula extends each curve to any horizon: growth is linear until
+the end of the tree's lifespan and flat afterwards. Published curve values are
+kept as an override for the years they cover.
+"""
+
+import numpy as np
+
+
+MAX_HORIZON = 100
+
+
+def annual_rates(biomass, carbon, conversion, survival):
+    """Per-tree CO₂ added each year of growth, by species."""
+    return biomass * carbon * conversion * survival
+
+
+def model_curves(rates, lifespan, first_year, last_year):
+    """Modelled per-tree values for years ``first_year..last_year``, species×years."""
+    years = np.arange(first_year, last_year + 1, dtype=np.float64)
+    return np.minimum(years[None, :], lifespan[:, None]) * rates[:, None]
+
+
+def extend_curves(curves, rates, lifespan, horizon):
+    """Curves over ``horizon`` years: published values first, the model after them."""
+    if not 1 <= horizon <= MAX_HORIZON:
+        raise ValueError(f"horizon must be between 1 and {MAX_HORIZON} years")
+
+    known = curves.shape[1]
+    if horizon <= known:
+        return curves[:, :horizon]
+
+    out = np.empty((curves.shape[0], horizon))
+    out[:, :known] = curves
+    out[:, known:] = model_curves(rates, lifespan, known + 1, horizon)
+    return out
@@ -0,0 +1,198 @@
+"""Species-mix optimizer: maximize survival-adjusted CO₂ under tree and cost budgets.
+
+The objective is linear in tree counts, so with only a tree budget the optimum is
+a greedy fill by per-tree value. A cost budget adds a second constraint, handled
+by bisecting a Lagrange multiplier on cost and topping up the remaining slack;
+the result tracks the LP optimum closely once budgets span more than a handful
+of trees.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+BISECTION_STEPS = 60
+SWEEP_DENSITY = 4
+
+
+@dataclass
+class MixResult:
+    counts: np.ndarray
+    trees: int
+    co2: float
+    cost: float
+
+    def plan(self, names):
+        return {names[i]: int(self.counts[i]) for i in np.flatnonzero(self.counts)}
+
+
+@dataclass
+class ParetoFront:
+    costs: np.ndarray
+    co2: np.ndarray
+    mixes: list
+
+
+def tree_values(matrix, horizon=None):
+    """Survival-adjusted CO₂ per planted tree over ``horizon`` years, by species."""
+    return matrix.survival * matrix.totals_for(horizon)
+
+
+def _as_array(values, default, size):
+    if values is None:
+        return np.full(size, default, dtype=np.float64)
+    return np.broadcast_to(np.asarray(values, dtype=np.float64), (size,)).copy()
+
+
+def _bounds(size, tree_budget, min_counts, max_counts):
+    lo = np.floor(_as_array(min_counts, 0, size))
+    hi = np.floor(np.minimum(_as_array(max_counts, tree_budget, size), tree_budget))
+    if np.any(lo < 0) or np.any(hi < lo):
+        raise ValueError("per-species limits must satisfy 0 <= min <= max")
+    if lo.sum() > tree_budget:
+        raise ValueError(f"minimum counts need {lo.sum():,.0f} trees, above the budget of {tree_budget:,}")
+    return lo, hi
+
+
+def _greedy(score, lo, hi, remaining):
+    """Fill the ``remaining`` trees into species with positive score, best first."""
+    counts = lo.copy()
+    candidates = np.flatnonzero((score > 0) & (hi > lo))
+    if remaining <= 0 or not len(candidates):
+        return counts
+    order = candidates[np.argsort(-score[candidates], kind="stable")]
+    room = hi[order] - lo[order]
+    before = np.cumsum(room) - room
+    counts[order] += np.clip(remaining - before, 0, room)
+    return counts
+
+
+def _top_up(counts, order, value, cost, hi, tree_budget, cost_budget):
+    """Spend the trees and cost left over on species in ``order``, as many of each as fit.
+
+    Runs of species that fit whole are added in one step; only a species cut
+    short by the cost budget ends a run.
+    """
+    counts = counts.copy()
+    trees_left = tree_budget - counts.sum()
+    cost_left = cost_budget - counts @ cost
+    order = order[(value[order] > 0) & (hi[order] > counts[order])]
+    while trees_left > 0:
+        order = order[(cost[order] <= 0) | (cost[order] <= cost_left)]
+        if not len(order):
+            break
+        room = hi[order] - counts[order]
+        fits = (np.cumsum(room) <= trees_left) & (np.cumsum(room * np.maximum(cost[order], 0)) <= cost_left)
+        whole = int(np.argmin(fits)) if not fits.all() else len(order)
+        counts[order[:whole]] = hi[order[:whole]]
+        trees_left -= room[:whole].sum()
+        cost_left -= room[:whole] @ cost[order[:whole]]
+        if whole == len(order):
+            break
+        i = order[whole]
+        affordable = room[whole] if cost[i] <= 0 else np.floor(cost_left / cost[i])
+        take = max(min(room[whole], trees_left, affordable), 0)
+        counts[i] += take
+        trees_left -= take
+        cost_left -= take * cost[i]
+        order = order[whole + 1:]
+    return counts
+
+
+def _result(counts, value, cost):
+    return MixResult(
+        counts=counts.astype(np.int64),
+        trees=int(counts.sum()),
+        co2=float(counts @ value),
+        cost=float(counts @ cost),
+    )
+
+
+def optimize_mix(matrix, tree_budget, min_counts=None, max_counts=None,
+                 cost_per_tree=None, cost_budget=None, horizon=None):
+    """Mix of at most ``tree_budget`` trees that maximizes CO₂ over ``horizon`` years."""
+    size = len(matrix)
+    value = tree_values(matrix, horizon)
+    cost = _as_array(cost_per_tree, 0.0, size)
+    lo, hi = _bounds(size, tree_budget, min_counts, max_counts)
+    remaining = tree_budget - lo.sum()
+
+    counts = _greedy(value, lo, hi, remaining)
+    if cost_budget is None or counts @ cost <= cost_budget:
+        return _result(counts, value, cost)
+
+    if lo @ cost > cost_budget:
+        raise ValueError(f"minimum counts cost {lo @ cost:,.2f}, above the budget of {cost_budget:,.2f}")
+
+    # Bracket the cost multiplier at which the greedy mix crosses the budget.
+    # The LP optimum lies between the two bracketing mixes, so blend them to
+    # spend the budget exactly and round down, which keeps both limits.
+    low = 0.0
+    high = float(np.max(value[cost > 0] / cost[cost > 0]))
+    over = counts
+    under = _greedy(np.where(cost > 0, 0.0, value), lo, hi, remaining)
+    for _ in range(BISECTION_STEPS):
+        mid = (low + high) / 2
+        trial = _greedy(value - mid * cost, lo, hi, remaining)
+        if trial @ cost <= cost_budget:
+            high, under = mid, trial
+        else:
+            low, over = mid, trial
+
+    share = (cost_budget - under @ cost) / (over @ cost - under @ cost)
+    blended = np.floor(under + share * (over - under) + 1e-9)
+
+    # Spend what is left of both budgets, trying both best CO₂ per unit cost
+    # and best CO₂ per tree first; with small budgets either can win.
+    ratio = np.divide(value, cost, out=np.full(size, np.inf), where=cost > 0)
+    counts = max(
+        (_top_up(start, order, value, cost, hi, tree_budget, cost_budget)
+         for start in (under, blended)
+         for order in (np.argsort(-ratio, kind="stable"), np.argsort(-value, kind="stable"))),
+        key=lambda c: c @ value,
+    )
+
+    return _result(counts, value, cost)
+
+
+def pareto_frontier(matrix, tree_budget, cost_per_tree, min_counts=None, max_counts=None,
+                    points=25, horizon=None):
+    """CO₂ against cost for optimal mixes between the cheapest and unconstrained plans.
+
+    The greedy mix for a cost multiplier is optimal for its own cost, so one
+    sweep of multipliers, spread over the species' CO₂-per-cost ratios, traces
+    the frontier; the mixes nearest evenly spaced costs are kept.
+    """
+    size = len(matrix)
+    value = tree_values(matrix, horizon)
+    cost = _as_array(cost_per_tree, 0.0, size)
+    lo, hi = _bounds(size, tree_budget, min_counts, max_counts)
+    remaining = tree_budget - lo.sum()
+
+    paid = (cost > 0) & (value > 0)
+    ratios = value[paid] / cost[paid] if paid.any() else np.ones(1)
+    multipliers = np.unique(np.concatenate((
+        [0.0],
+        np.quantile(ratios, np.linspace(0, 1, SWEEP_DENSITY * points)),
+        ratios.max() * np.geomspace(1e-6, 1, SWEEP_DENSITY * points),
+    )))
+
+    frontier = []
+    for multiplier in multipliers[::-1]:
+        mix = _result(_greedy(value - multiplier * cost, lo, hi, remaining), value, cost)
+        if not frontier or mix.co2 > frontier[-1].co2:
+            frontier.append(mix)
+
+    # Keep the mixes nearest to evenly spaced costs, always including both ends.
+    if len(frontier) > points:
+        costs = np.array([m.cost for m in frontier])
+        targets = np.linspace(costs[0], costs[-1], points)
+        keep = np.unique(np.abs(costs[:, None] - targets).argmin(axis=0))
+        frontier = [frontier[i] for i in keep]
+
+    return ParetoFront(
+        costs=np.array([m.cost for m in frontier]),
+        co2=np.array([m.co2 for m in frontier]),
+        mixes=frontier,
+    )
@@ -0,0 +1,461 @@
+"""Vectorized CO₂ projection engine for planting plans (no Streamlit dependency)."""
+
+import hashlib
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+import growth
+
+
+def unique_rows(a):
+    """``(first, inverse)`` for the distinct rows of a 2-D array: ``a[first][inverse]`` equals ``a``.
+
+    Rows are compared as raw bytes, which is several times faster than
+    ``np.unique(axis=0)``.
+    """
+    a = np.ascontiguousarray(a)
+    rows = a.view(np.dtype((np.void, a.dtype.itemsize * a.shape[1]))).ravel()
+    _, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+    return first, inverse.reshape(-1)
+
+
+@dataclass
+class CurveTable:
+    """Per-tree curves stored once per distinct curve.
+
+    Species ``i`` uses row ``ids[i]`` of ``curves``; ``cumulative`` and ``totals``
+    are the rows' running sums and final totals, computed once.
+    """
+
+    ids: np.ndarray
+    curves: np.ndarray
+    cumulative: np.ndarray
+    totals: np.ndarray
+
+    @classmethod
+    def intern(cls, curves, ids=None):
+        """Table of the distinct rows of ``curves``, species×years (or rows already picked by ``ids``)."""
+        curves = np.asarray(curves, dtype=np.float64)
+        if ids is None:
+            first, ids = unique_rows(curves)
+            curves = curves[first]
+        cumulative = np.cumsum(curves, axis=1)
+        return cls(np.asarray(ids, dtype=np.intp).reshape(-1), curves, cumulative, cumulative[:, -1].copy())
+
+    def __len__(self):
+        return len(self.curves)
+
+    @property
+    def horizon(self):
+        return self.curves.shape[1]
+
+    def truncate(self, horizon):
+        cumulative = self.cumulative[:, :horizon]
+        return CurveTable(self.ids, self.curves[:, :horizon], cumulative, cumulative[:, -1].copy())
+
+
+class SpeciesMatrix:
+    """Species×year view of a tree catalog, built once and shared by every plan.
+
+    Metadata are one array per field. The published per-tree curves are kept in
+    a :class:`CurveTable`, so species with identical curves share one row; other
+    horizons are derived from the growth model on first use and cached per
+    horizon the same way. ``attrition`` holds optional per-age survival curves,
+    species×ages, with NaN rows for species that only give a Survival_Rate.
+    """
+
+    def __init__(self, names, survival, lifespan, curves, biomass, carbon, conversion, attrition=None):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.survival = np.asarray(survival, dtype=np.float64)
+        self.lifespan = np.asarray(lifespan, dtype=np.float64)
+        self.biomass = np.asarray(biomass, dtype=np.float64)
+        self.carbon = np.asarray(carbon, dtype=np.float64)
+        self.conversion = np.asarray(conversion, dtype=np.float64)
+        self.table = curves if isinstance(curves, CurveTable) else CurveTable.intern(curves)
+        self.attrition = (np.empty((len(self.names), 0)) if attrition is None
+                          else np.asarray(attrition, dtype=np.float64))
+        self.years = np.arange(1, self.horizon + 1)
+        self._horizons = {self.horizon: self.table}
+
+    @classmethod
+    def from_tree_data(cls, tree_data):
+        names = list(tree_data.keys())
+        survival_curves = [tree_data[name].get("Survival_Curve") for name in names]
+        ages = max((len(curve) for curve in survival_curves if curve), default=0)
+        attrition = np.full((len(names), ages), np.nan)
+        for i, curve in enumerate(survival_curves):
+            if curve:
+                attrition[i, :len(curve)] = curve
+                attrition[i, len(curve):] = curve[-1]
+        return cls(
+            names,
+            [tree_data[name]["Survival_Rate"] for name in names],
+            [tree_data[name]["Lifespan_Years"] for name in names],
+            [tree_data[name]["CO2_Sequestration_20yrs"] for name in names],
+            [tree_data[name]["Avg_Biomass_kg_per_year"] for name in names],
+            [tree_data[name]["Carbon_Content_Ratio"] for name in names],
+            [tree_data[name]["CO2_Conversion_Factor"] for name in names],
+            attrition,
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def horizon(self):
+        return self.table.horizon
+
+    @property
+    def curves(self):
+        """Published per-tree curves, species×years (a new array on every access)."""
+        return self.curves_for()
+
+    @property
+    def totals(self):
+        return self.totals_for()
+
+    def table_for(self, horizon=None):
+        """The :class:`CurveTable` over ``horizon`` years (the published horizon by default)."""
+        horizon = self.horizon if horizon is None else int(horizon)
+        cached = self._horizons.get(horizon)
+        if cached is None:
+            if not 1 <= horizon <= growth.MAX_HORIZON:
+                raise ValueError(f"horizon must be between 1 and {growth.MAX_HORIZON} years")
+            if horizon < self.horizon:
+                cached = self.table.truncate(horizon)
+            else:
+                # Modelled years depend on the growth rate and lifespan as well as
+                # the published curve, so species are interned on all three.
+                rates = growth.annual_rates(self.biomass, self.carbon, self.conversion, self.survival)
+                first, ids = unique_rows(np.column_stack([self.table.ids, rates, self.lifespan]))
+                curves = growth.extend_curves(self.table.curves[self.table.ids[first]],
+                                              rates[first], self.lifespan[first], horizon)
+                cached = CurveTable.intern(curves, ids)
+            self._horizons[horizon] = cached
+        return cached
+
+    def curves_for(self, horizon=None, idx=None):
+        """Per-tree curves over ``horizon`` years for species ``idx`` (all species by default)."""
+        table = self.table_for(horizon)
+        return table.curves[table.ids if idx is None else table.ids[idx]]
+
+    def cumulative_for(self, horizon=None, idx=None):
+        table = self.table_for(horizon)
+        return table.cumulative[table.ids if idx is None else table.ids[idx]]
+
+    def totals_for(self, horizon=None, idx=None):
+        table = self.table_for(horizon)
+        return table.totals[table.ids if idx is None else table.ids[idx]]
+
+    def survival_curves_for(self, horizon=None):
+        """Fraction of a cohort alive at each age 1..horizon, species×ages.
+
+        Species without a Survival_Curve keep their Survival_Rate at every age, the
+        model every other projection uses, so a single round reproduces project().
+        """
+        horizon = self.horizon if horizon is None else int(horizon)
+        out = np.repeat(self.survival[:, None], horizon, axis=1)
+        known = self.attrition.shape[1]
+        if known:
+            given = ~np.isnan(self.attrition[:, 0])
+            out[given, :min(known, horizon)] = self.attrition[given, :horizon]
+            if horizon > known:
+                out[given, known:] = self.attrition[given, -1:]
+        return out
+
+    def indices(self, species):
+        return np.fromiter((self.index[name] for name in species), dtype=np.intp, count=len(species))
+
+
+@dataclass
+class Projection:
+    species: list
+    years: np.ndarray
+    counts: np.ndarray
+    survival: np.ndarray
+    lifespan: np.ndarray
+    survivors: np.ndarray
+    annual: np.ndarray
+    cumulative: np.ndarray
+    totals: np.ndarray
+    per_tree: np.ndarray
+
+    @property
+    def total_trees(self):
+        return int(self.counts.sum())
+
+    @property
+    def total_survivors(self):
+        return float(self.survivors.sum())
+
+    @property
+    def total_co2(self):
+        return float(self.totals.sum())
+
+    @property
+    def co2_per_tree(self):
+        return self.total_co2 / self.total_trees if self.total_trees else 0.0
+
+    @property
+    def annual_total(self):
+        return self.annual.sum(axis=0)
+
+    @property
+    def cumulative_total(self):
+        return self.cumulative.sum(axis=0)
+
+
+def normalize_plan(matrix, plan):
+    """Canonical form of a plan: ``((species, count), ...)`` in catalog order, zero counts dropped.
+
+    Counts must already have passed :func:`plan_error`, so ``int`` never changes them.
+    """
+    items = [(name, int(count)) for name, count in plan.items() if count > 0]
+    return tuple(sorted(items, key=lambda item: matrix.index[item[0]]))
+
+
+def plan_key(catalog_version, normalized_plan, *options):
+    """Stable hash of a normalized plan, its catalog version and any view options."""
+    digest = hashlib.sha1(catalog_version.encode())
+    digest.update(repr((normalized_plan, options)).encode())
+    return digest.hexdigest()
+
+
+def project(matrix, plan, horizon=None):
+    """Project a ``{species: tree_count}`` plan over ``horizon`` years."""
+    species = list(plan.keys())
+    idx = matrix.indices(species)
+    counts = np.fromiter(plan.values(), dtype=np.float64, count=len(species))
+    survival = matrix.survival[idx]
+    survivors = counts * survival
+
+    annual = survivors[:, None] * matrix.curves_for(horizon, idx)
+    cumulative = survivors[:, None] * matrix.cumulative_for(horizon, idx)
+    totals = survivors * matrix.totals_for(horizon, idx)
+    per_tree = np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0)
+
+    return Projection(
+        species=species,
+        years=np.arange(1, annual.shape[1] + 1),
+        counts=counts,
+        survival=survival,
+        lifespan=matrix.lifespan[idx],
+        survivors=survivors,
+        annual=annual,
+        cumulative=cumulative,
+        totals=totals,
+        per_tree=per_tree,
+    )
+
+
+class IncrementalProjection:
+    """A plan's aggregates kept current by applying only the species whose counts change.
+
+    Per-species counts, survivors and totals are held for the whole catalog (zero
+    where nothing is planted) next to running totals and the annual total series,
+    so changing one count costs O(horizon) rather than a pass over the selection.
+    The matrix and horizon are fixed; start a new instance when either changes.
+    """
+
+    REBASE_EVERY = 1000
+
+    def __init__(self, matrix, horizon=None):
+        self.matrix = matrix
+        self.table = matrix.table_for(horizon)
+        self.curve_totals = self.table.totals[self.table.ids]
+        self.years = np.arange(1, self.table.horizon + 1)
+        self.plan = {}
+        self.counts = np.zeros(len(matrix))
+        self.survivors = np.zeros(len(matrix))
+        self.totals = np.zeros(len(matrix))
+        self.annual_total = np.zeros(len(self.years))
+        self.total_trees = 0
+        self.total_survivors = 0.0
+        self.total_co2 = 0.0
+        self.updates = 0
+
+    @property
+    def cumulative_total(self):
+        return np.cumsum(self.annual_total)
+
+    @property
+    def co2_per_tree(self):
+        return self.total_co2 / self.total_trees if self.total_trees else 0.0
+
+    def update(self, plan):
+        """Move to ``plan`` and return the catalog indices whose counts changed."""
+        changed = list({name for name, _ in plan.items() ^ self.plan.items()})
+        self.plan = dict(plan)
+        if not changed:
+            return np.empty(0, dtype=np.intp)
+
+        idx = self.matrix.indices(changed)
+        counts = np.fromiter((plan.get(name, 0) for name in changed), dtype=np.float64, count=len(changed))
+        survivors = counts * self.matrix.survival[idx]
+        delta = survivors - self.survivors[idx]
+
+        self.total_trees += int(counts.sum() - self.counts[idx].sum())
+        self.total_survivors += float(delta.sum())
+        self.total_co2 += float(delta @ self.curve_totals[idx])
+        self.annual_total += delta @ self.table.curves[self.table.ids[idx]]
+        self.counts[idx] = counts
+        self.survivors[idx] = survivors
+        self.totals[idx] = survivors * self.curve_totals[idx]
+
+        self.updates += 1
+        if self.updates % self.REBASE_EVERY == 0:
+            self._rebase()
+        return idx
+
+    def _rebase(self):
+        """Recompute the running sums from the per-species arrays to drop accumulated rounding."""
+        self.total_trees = int(self.counts.sum())
+        self.total_survivors = float(self.survivors.sum())
+        self.total_co2 = float(self.totals.sum())
+        # Survivors sharing a curve are summed first, so this is one row per distinct curve.
+        weights = np.bincount(self.table.ids, weights=self.survivors, minlength=len(self.table))
+        self.annual_total = weights @ self.table.curves
+
+    def selected(self):
+        return np.flatnonzero(self.counts)
+
+    def projection(self):
+        """The full per-species :class:`Projection` of the current plan, for charts."""
+        idx = self.selected()
+        counts = self.counts[idx]
+        survivors = self.survivors[idx]
+        rows = self.table.ids[idx]
+        annual = survivors[:, None] * self.table.curves[rows]
+        cumulative = survivors[:, None] * self.table.cumulative[rows]
+        totals = survivors * self.table.totals[rows]
+        return Projection(
+            species=[self.matrix.names[i] for i in idx],
+            years=self.years,
+            counts=counts,
+            survival=self.matrix.survival[idx],
+            lifespan=self.matrix.lifespan[idx],
+            survivors=survivors,
+            annual=annual,
+            cumulative=cumulative,
+            totals=totals,
+            per_tree=np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0),
+        )
+
+
+@dataclass
+class PlanMetrics:
+    total_trees: np.ndarray
+    survivors: np.ndarray
+    co2: np.ndarray
+    co2_per_tree: np.ndarray
+
+
+def _flatten(plans):
+    sizes = np.fromiter((len(plan) for plan in plans), dtype=np.intp, count=len(plans))
+    rows = np.repeat(np.arange(len(plans)), sizes)
+    return sizes, rows
+
+
+def _entries(matrix, plans, sizes):
+    idx = np.fromiter(
+        (matrix.index[name] for plan in plans for name in plan),
+        dtype=np.intp,
+        count=int(sizes.sum()),
+    )
+    counts = np.fromiter(
+        (count for plan in plans for count in plan.values()),
+        dtype=np.float64,
+        count=int(sizes.sum()),
+    )
+    return idx, counts
+
+
+def _metrics(n_plans, rows, counts, survivors, co2):
+    # bincount returns int64 when there are no entries at all; keep every column float.
+    total_trees = np.bincount(rows, weights=counts, minlength=n_plans).astype(np.float64)
+    total_survivors = np.bincount(rows, weights=survivors, minlength=n_plans).astype(np.float64)
+    total_co2 = np.bincount(rows, weights=co2, minlength=n_plans).astype(np.float64)
+    per_tree = np.divide(total_co2, total_trees, out=np.zeros_like(total_co2), where=total_trees > 0)
+    return PlanMetrics(total_trees, total_survivors, total_co2, per_tree)
+
+
+def evaluate_plans(matrix, plans, horizon=None):
+    """Headline metrics for many ``{species: tree_count}`` plans in one sparse pass."""
+    sizes, rows = _flatten(plans)
+    idx, counts = _entries(matrix, plans, sizes)
+
+    survivors = counts * matrix.survival[idx]
+    co2 = survivors * matrix.totals_for(horizon, idx)
+    return _metrics(len(plans), rows, counts, survivors, co2)
+
+
+@dataclass
+class PlanSeries:
+    """Metrics, per-species values and yearly totals for a batch of plans.
+
+    Per-species arrays are flat; plan ``p`` owns entries ``offsets[p]:offsets[p + 1]``,
+    in the order of its keys.
+    """
+
+    metrics: PlanMetrics
+    years: np.ndarray
+    offsets: np.ndarray
+    species_idx: np.ndarray
+    counts: np.ndarray
+    survivors: np.ndarray
+    co2: np.ndarray
+    annual: np.ndarray
+
+    @property
+    def cumulative(self):
+        return np.cumsum(self.annual, axis=1)
+
+
+def evaluate_plan_series(matrix, plans, horizon=None):
+    """Like :func:`evaluate_plans`, plus per-species totals and annual series; plans must be non-empty."""
+    sizes, rows = _flatten(plans)
+    idx, counts = _entries(matrix, plans, sizes)
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+
+    table = matrix.table_for(horizon)
+    curve_idx = table.ids[idx]
+    survivors = counts * matrix.survival[idx]
+    co2 = survivors * table.totals[curve_idx]
+    annual = np.add.reduceat(survivors[:, None] * table.curves[curve_idx], offsets[:-1], axis=0)
+
+    return PlanSeries(
+        metrics=_metrics(len(plans), rows, counts, survivors, co2),
+        years=np.arange(1, table.horizon + 1),
+        offsets=offsets,
+        species_idx=idx,
+        counts=counts,
+        survivors=survivors,
+        co2=co2,
+        annual=annual,
+    )
+
+
+def _is_tree_count(count):
+    """True if ``count`` is a finite, non-negative whole number (``10`` or ``10.0``)."""
+    if isinstance(count, bool) or not isinstance(count, (int, float)):
+        return False
+    try:
+        value = float(count)
+    except OverflowError:
+        return False
+    return math.isfinite(value) and value >= 0 and value.is_integer()
+
+
+def plan_error(matrix, plan):
+    """Why ``plan`` cannot be evaluated against ``matrix``, or None if it can."""
+    if not isinstance(plan, dict) or not plan:
+        return "plan must be a non-empty mapping of species to tree count"
+    for name, count in plan.items():
+        if name not in matrix.index:
+            return f"unknown species: {name}"
+        if not _is_tree_count(count):
+            return f"invalid tree count for {name}: {count!r} (expected a whole number of trees)"
+    return None
@@ -0,0 +1,159 @@
+"""Regional survival and growth adjustments, evaluated as one region×species×year tensor."""
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from catalog import DATASET_DIR, CatalogError, load_cached, parse_json
+from projection import Projection
+
+
+DEFAULT_REGIONS = os.path.join(DATASET_DIR, "regions.json")
+
+MULTIPLIERS = ("survival_multiplier", "growth_multiplier")
+
+
+class RegionSet:
+    def __init__(self, path, version, regions):
+        self.path = path
+        self.version = version
+        self.regions = regions
+
+    @property
+    def names(self):
+        return list(self.regions.keys())
+
+    def multipliers(self, matrix, names=None):
+        """Survival and growth multipliers for ``names``, each shaped regions×species."""
+        names = self.names if names is None else list(names)
+        survival = np.ones((len(names), len(matrix)))
+        growth = np.ones((len(names), len(matrix)))
+
+        for r, name in enumerate(names):
+            profile = self.regions[name]
+            survival[r] = profile.get("survival_multiplier", 1.0)
+            growth[r] = profile.get("growth_multiplier", 1.0)
+            for species, override in profile.get("species", {}).items():
+                i = matrix.index.get(species)
+                if i is None:
+                    continue
+                survival[r, i] *= override.get("survival_multiplier", 1.0)
+                growth[r, i] *= override.get("growth_multiplier", 1.0)
+
+        return survival, growth
+
+
+def _check_multipliers(where, record, errors):
+    for field in MULTIPLIERS:
+        value = record.get(field, 1.0)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            errors.append(f"{where}: {field} must be a non-negative number")
+
+
+def validate_regions(payload):
+    if not isinstance(payload, dict) or not isinstance(payload.get("regions"), dict):
+        raise CatalogError("region file must be an object with a 'regions' mapping")
+
+    errors = []
+    for name, profile in payload["regions"].items():
+        if not isinstance(profile, dict):
+            errors.append(f"{name}: profile must be an object")
+            continue
+        _check_multipliers(name, profile, errors)
+        species = profile.get("species", {})
+        if not isinstance(species, dict):
+            errors.append(f"{name}: species must be a mapping")
+            continue
+        for species_name, override in species.items():
+            if not isinstance(override, dict):
+                errors.append(f"{name} / {species_name}: override must be an object")
+            else:
+                _check_multipliers(f"{name} / {species_name}", override, errors)
+
+    if errors:
+        raise CatalogError("invalid region profiles: " + "; ".join(errors[:10]))
+    return payload["regions"]
+
+
+def _build_regions(path, raw, version):
+    return RegionSet(path, version, validate_regions(parse_json(path, raw)))
+
+
+def load_regions(path=DEFAULT_REGIONS):
+    return load_cached(path, _build_regions)
+
+
+@dataclass
+class RegionProjection:
+    regions: list
+    species: list
+    years: np.ndarray
+    counts: np.ndarray
+    lifespan: np.ndarray
+    survival: np.ndarray
+    survivors: np.ndarray
+    annual: np.ndarray
+    cumulative: np.ndarray
+    totals: np.ndarray
+
+    @property
+    def total_survivors(self):
+        return self.survivors.sum(axis=1)
+
+    @property
+    def total_co2(self):
+        return self.totals.sum(axis=1)
+
+    @property
+    def cumulative_total(self):
+        return self.cumulative.sum(axis=1)
+
+    def region(self, r):
+        """The projection for one region, as the dashboard's per-plan views expect it."""
+        return Projection(
+            species=self.species,
+            years=self.years,
+            counts=self.counts,
+            survival=self.survival[r],
+            lifespan=self.lifespan,
+            survivors=self.survivors[r],
+            annual=self.annual[r],
+            cumulative=self.cumulative[r],
+            totals=self.totals[r],
+            per_tree=np.divide(self.totals[r], self.counts, out=np.zeros(len(self.counts)),
+                               where=self.counts > 0),
+        )
+
+
+def project_regions(matrix, plan, region_set, names=None, horizon=None):
+    """Project a plan under every region profile in one broadcasted pass."""
+    names = region_set.names if names is None else list(names)
+    species = list(plan.keys())
+    idx = matrix.indices(species)
+    counts = np.fromiter(plan.values(), dtype=np.float64, count=len(species))
+
+    survival_mult, growth_mult = region_set.multipliers(matrix, names)
+    base = matrix.survival[idx]
+    survival = np.clip(base * survival_mult[:, idx], 0.0, 1.0)
+    survivors = counts * survival
+    # The per-tree curves already carry Survival_Rate (see growth), so a regional
+    # rate rescales them as well as the survivors, as in sensitivity.sweep.
+    curve_scale = np.divide(survival, base, out=np.ones_like(survival), where=base > 0)
+
+    curves = matrix.curves_for(horizon, idx)
+    annual = (survivors * curve_scale * growth_mult[:, idx])[:, :, None] * curves[None, :, :]
+    cumulative = np.cumsum(annual, axis=2)
+
+    return RegionProjection(
+        regions=names,
+        species=species,
+        years=np.arange(1, curves.shape[1] + 1),
+        counts=counts,
+        lifespan=matrix.lifespan[idx],
+        survival=survival,
+        survivors=survivors,
+        annual=annual,
+        cumulative=cumulative,
+        totals=cumulative[:, :, -1],
+    )
@@ -0,0 +1,286 @@
+"""Planting registers: one row per plot with species, tree count, planting year and site.
+
+Registers can run to millions of rows, so they are read in chunks (CSV through
+pandas, Parquet through pyarrow) and folded into tree counts per site, species
+and planting year as each chunk arrives. Memory grows with the number of
+distinct combinations, not with the file. Species names are matched to the
+catalog through a precomputed index that ignores case and surrounding
+whitespace; rows naming other species are set aside and reported::
+
+    python registers.py plantings.parquet --horizon 30
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+ROWS_PER_CHUNK = 250_000
+COMPACT_ROWS = 1_000_000
+MAX_UNKNOWN = 1000
+NO_SITE = "(no site)"
+
+# Accepted header names per column, compared case-insensitively.
+COLUMNS = {
+    "species": ("species", "species_name"),
+    "count": ("count", "trees", "tree_count"),
+    "planting_year": ("planting_year", "year", "planted"),
+    "site": ("site", "plot", "site_id"),
+}
+REQUIRED = ("species", "count")
+
+
+class RegisterError(ValueError):
+    pass
+
+
+def _normalize(name):
+    return " ".join(str(name).split()).casefold()
+
+
+class SpeciesIndex:
+    """Catalog species names by normalized spelling, for matching register rows."""
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.lookup = {_normalize(name): i for i, name in enumerate(self.names)}
+
+    def indices(self, values):
+        """Catalog index of each value (-1 where unknown) and the distinct values seen.
+
+        Names are normalized once per distinct value, not once per row.
+        """
+        codes, uniques = pd.factorize(values)
+        mapped = np.fromiter((self.lookup.get(_normalize(name), -1) for name in uniques),
+                             dtype=np.intp, count=len(uniques))
+        return np.where(codes >= 0, mapped[np.maximum(codes, 0)], -1), uniques
+
+
+@dataclass
+class Register:
+    """Tree counts per (site, species, planting year) group of a register."""
+
+    names: list
+    sites: list
+    site_idx: np.ndarray
+    species_idx: np.ndarray
+    years: np.ndarray
+    counts: np.ndarray
+    rows: int
+    skipped: int
+    unknown: dict
+
+    @property
+    def first_year(self):
+        return int(self.years.min())
+
+    @property
+    def last_year(self):
+        return int(self.years.max())
+
+    @property
+    def total_trees(self):
+        return int(self.counts.sum())
+
+    def plan(self):
+        """Trees per species over all sites and years, in catalog order."""
+        totals = np.bincount(self.species_idx, weights=self.counts, minlength=len(self.names))
+        return {self.names[i]: int(totals[i]) for i in np.flatnonzero(totals)}
+
+    def program_years(self):
+        """Planting years counted from the register's first, which is year 1."""
+        return self.years - self.first_year + 1
+
+    def schedule(self):
+        """``{species: counts by planting year}`` for :func:`cohorts.project_schedule`."""
+        species = np.flatnonzero(np.bincount(self.species_idx, minlength=len(self.names)))
+        row = np.full(len(self.names), -1)
+        row[species] = np.arange(len(species))
+        counts = np.zeros((len(species), self.last_year - self.first_year + 1))
+        np.add.at(counts, (row[self.species_idx], self.program_years() - 1), self.counts)
+        return {self.names[i]: counts[r].tolist() for r, i in enumerate(species.tolist())}
+
+    def site_totals(self, matrix, horizon=None):
+        """Trees, expected survivors and CO₂ per site at the end of ``horizon`` years.
+
+        A cohort planted in program year ``p`` is ``horizon - p + 1`` years old at the
+        end; its CO₂ is the survival-weighted per-tree curve summed over those ages,
+        so the sites add up to the projection of :meth:`schedule`.
+        """
+        idx = matrix.indices(self.names)
+        curves = matrix.curves_for(horizon, idx)
+        horizon = curves.shape[1]
+        alive = matrix.survival_curves_for(horizon)[idx]
+        per_tree = np.cumsum(alive * curves, axis=1)
+
+        age = horizon - self.program_years()
+        planted = age >= 0
+        age = np.clip(age, 0, horizon - 1)
+        counts = np.where(planted, self.counts, 0.0)
+        survivors = counts * alive[self.species_idx, age]
+        co2 = counts * per_tree[self.species_idx, age]
+
+        n = len(self.sites)
+        return pd.DataFrame({
+            "Site": self.sites,
+            "Trees Planted": np.bincount(self.site_idx, weights=self.counts, minlength=n).astype(np.int64),
+            "Expected Survivors": np.bincount(self.site_idx, weights=survivors, minlength=n),
+            f"Total CO₂ ({horizon} years, kg)": np.bincount(self.site_idx, weights=co2, minlength=n),
+        })
+
+
+def _resolve_columns(header):
+    by_name = {str(column).strip().casefold(): column for column in header}
+    resolved = {}
+    for field, aliases in COLUMNS.items():
+        for alias in aliases:
+            if alias in by_name:
+                resolved[field] = by_name[alias]
+                break
+    missing = [field for field in REQUIRED if field not in resolved]
+    if missing:
+        raise RegisterError(
+            "register needs columns " + ", ".join(REQUIRED) + " (optional: planting_year, site); "
+            "missing " + ", ".join(missing)
+        )
+    return resolved
+
+
+def iter_chunks(source, fmt="csv", rows_per_chunk=ROWS_PER_CHUNK):
+    """Yield DataFrame chunks of a register with columns renamed to :data:`COLUMNS` keys."""
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(source)
+        columns = _resolve_columns(parquet.schema_arrow.names)
+        rename = {column: field for field, column in columns.items()}
+        for batch in parquet.iter_batches(batch_size=rows_per_chunk, columns=list(columns.values())):
+            yield batch.to_pandas().rename(columns=rename)
+        return
+
+    if fmt != "csv":
+        raise RegisterError(f"unsupported register format: {fmt}")
+    header = pd.read_csv(source, nrows=0).columns
+    columns = _resolve_columns(header)
+    rename = {column: field for field, column in columns.items()}
+    if hasattr(source, "seek"):
+        source.seek(0)
+    dtype = {columns[field]: str for field in ("species", "site") if field in columns}
+    yield from (chunk.rename(columns=rename) for chunk in pd.read_csv(
+        source, usecols=list(columns.values()), dtype=dtype, chunksize=rows_per_chunk
+    ))
+
+
+def _compact(parts):
+    frame = pd.concat(parts, ignore_index=True)
+    return frame.groupby(["site", "species", "year"], sort=False, as_index=False)["count"].sum()
+
+
+def read_register(source, names, fmt="csv", rows_per_chunk=ROWS_PER_CHUNK):
+    """Read a register from a path or file object and aggregate it against catalog ``names``.
+
+    Rows without a usable count (missing, non-numeric, zero or negative) or
+    planting year are skipped; rows whose species is not in the catalog are
+    totalled by name in ``unknown`` (the first :data:`MAX_UNKNOWN` names, each
+    under its first spelling).
+    """
+    index = SpeciesIndex(names)
+    site_ids = {}
+    unknown, unknown_names = {}, {}
+    parts, part_rows = [], 0
+    rows = skipped = 0
+
+    for chunk in iter_chunks(source, fmt, rows_per_chunk):
+        rows += len(chunk)
+        counts = pd.to_numeric(chunk["count"], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        if "planting_year" in chunk:
+            years = pd.to_numeric(chunk["planting_year"], errors="coerce").to_numpy(dtype=np.float64,
+                                                                                    na_value=np.nan)
+        else:
+            years = np.ones(len(chunk))
+        usable = (counts > 0) & np.isfinite(counts) & np.isfinite(years) & (years == np.round(years))
+        skipped += int((~usable).sum())
+
+        species, _ = index.indices(chunk["species"])
+        missing = usable & (species < 0) & chunk["species"].notna().to_numpy()
+        if missing.any():
+            by_name = pd.Series(counts[missing]).groupby(chunk["species"].to_numpy()[missing]).sum()
+            for name, trees in by_name.items():
+                # Spellings that differ only in case or spacing are one unknown species.
+                name = unknown_names.get(_normalize(name)) or name
+                if name in unknown or len(unknown) < MAX_UNKNOWN:
+                    unknown_names.setdefault(_normalize(name), name)
+                    unknown[name] = unknown.get(name, 0) + int(trees)
+        keep = usable & (species >= 0)
+        skipped += int((usable & (species < 0) & ~missing).sum())
+
+        if "site" in chunk:
+            codes, uniques = pd.factorize(chunk["site"].fillna(NO_SITE))
+            mapped = np.fromiter((site_ids.setdefault(str(site), len(site_ids)) for site in uniques),
+                                 dtype=np.intp, count=len(uniques))
+            sites = mapped[codes]
+        else:
+            sites = np.full(len(chunk), site_ids.setdefault(NO_SITE, len(site_ids)), dtype=np.intp)
+
+        part = pd.DataFrame({
+            "site": sites[keep],
+            "species": species[keep],
+            "year": years[keep].astype(np.int64),
+            "count": counts[keep],
+        }).groupby(["site", "species", "year"], sort=False, as_index=False)["count"].sum()
+        parts.append(part)
+        part_rows += len(part)
+        if part_rows > COMPACT_ROWS:
+            parts = [_compact(parts)]
+            part_rows = len(parts[0])
+
+    groups = _compact(parts) if parts else pd.DataFrame({"site": [], "species": [], "year": [], "count": []})
+    if groups.empty:
+        raise RegisterError("register has no rows for species in the catalog")
+    return Register(
+        names=index.names,
+        sites=list(site_ids),
+        site_idx=groups["site"].to_numpy(dtype=np.intp),
+        species_idx=groups["species"].to_numpy(dtype=np.intp),
+        years=groups["year"].to_numpy(dtype=np.int64),
+        counts=groups["count"].to_numpy(dtype=np.float64),
+        rows=rows,
+        skipped=skipped,
+        unknown=dict(sorted(unknown.items(), key=lambda item: -item[1])),
+    )
+
+
+def register_format(file_name):
+    return "parquet" if file_name.lower().endswith((".parquet", ".pq")) else "csv"
+
+
+def main(argv=None):
+    from catalog import DEFAULT_CATALOG, load_catalog
+    from cohorts import project_schedule
+
+    parser = argparse.ArgumentParser(description="Summarize a planting register against a species catalog.")
+    parser.add_argument("register", help="CSV or Parquet file with species, count, planting_year, site columns")
+    parser.add_argument("--catalog", default=DEFAULT_CATALOG, help="species catalog JSON")
+    parser.add_argument("--horizon", type=int, default=None, help="projection horizon in years (default: 20)")
+    args = parser.parse_args(argv)
+
+    catalog = load_catalog(args.catalog)
+    try:
+        register = read_register(args.register, catalog.names, register_format(args.register))
+    except (OSError, RegisterError) as e:
+        parser.error(str(e))
+    projection = project_schedule(catalog.matrix, register.schedule(), args.horizon)
+
+    print(f"{register.rows:,} rows: {register.total_trees:,} trees of {len(register.plan()):,} species "
+          f"at {len(register.sites):,} sites, planted {register.first_year}-{register.last_year}")
+    print(f"{register.skipped:,} rows skipped, {len(register.unknown):,} unknown species names")
+    print(f"Expected survivors {projection.total_survivors:,.0f}, "
+          f"CO₂ over {len(projection.years)} years {projection.total_co2:,.0f} kg")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""Downloadable report bundles, built off the Streamlit script thread.
+
+A report is a ZIP holding one self-contained HTML page (Key Metrics, the charts
+with plotly.js embedded so it opens offline, and the species details) next to
+the data as files: the species details and year-by-year tables as CSV and the
+metrics as JSON. Jobs run on a small process-wide thread pool and report their
+progress while they run. A finished bundle goes into the shared cache under its
+report key, so the same plan asked for again (from any session) is served at
+once.
+"""
+
+import html
+import io
+import json
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import export
+from shared_cache import cache as shared_cache
+
+
+MAX_WORKERS = 2
+MAX_QUEUED = 8
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: system-ui, sans-serif; margin: 2rem auto; max-width: 1100px; color: #1f2937; }}
+.metrics {{ display: flex; gap: 1rem; flex-wrap: wrap; }}
+.metric {{ border: 1px solid #e5e7eb; border-radius: 8px; padding: 0.75rem 1rem; flex: 1; min-width: 180px; }}
+.metric .label {{ font-size: 0.85rem; color: #6b7280; }}
+.metric .value {{ font-size: 1.5rem; font-weight: 600; }}
+.metric .note {{ font-size: 0.8rem; color: #6b7280; }}
+table {{ border-collapse: collapse; width: 100%; font-size: 0.9rem; }}
+th, td {{ border-bottom: 1px solid #e5e7eb; padding: 0.35rem 0.5rem; text-align: right; }}
+th:first-child, td:first-child {{ text-align: left; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p>{subtitle}</p>
+<h2>Key Metrics</h2>
+<div class="metrics">{metrics}</div>
+{charts}
+<h2>Species Details</h2>
+{details}
+<p>Year-by-year data: <code>year_by_year.csv</code> in this bundle.</p>
+</body>
+</html>
+"""
+
+
+class ReportQueueFull(RuntimeError):
+    pass
+
+
+class ReportJob:
+    """One report build; ``progress`` and ``message`` are updated as it runs."""
+
+    def __init__(self, key, steps=1):
+        self.key = key
+        self.steps = steps
+        self.completed = 0
+        self.message = "Queued"
+        self.payload = None
+        self.error = None
+        self._done = threading.Event()
+
+    @classmethod
+    def finished(cls, key, payload):
+        job = cls(key)
+        job.completed, job.message, job.payload = 1, "Done", payload
+        job._done.set()
+        return job
+
+    @property
+    def progress(self):
+        return min(self.completed / self.steps, 1.0)
+
+    def advance(self, message):
+        self.message = message
+        self.completed += 1
+
+    def done(self):
+        return self._done.is_set()
+
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="report")
+_jobs = {}
+_lock = threading.Lock()
+
+
+def _metric_cards(metrics):
+    cards = []
+    for label, value, note in metrics:
+        cards.append(
+            f'<div class="metric"><div class="label">{html.escape(label)}</div>'
+            f'<div class="value">{html.escape(value)}</div>'
+            + (f'<div class="note">{html.escape(note)}</div>' if note else "")
+            + "</div>"
+        )
+    return "".join(cards)
+
+
+def build_report(job, title, subtitle, metrics, figures, details, projections, metadata):
+    """Write the ZIP bundle and return its bytes, advancing ``job`` after each part.
+
+    ``metrics`` holds ``(label, value, note)`` rows, ``figures`` ``(heading, figure)``
+    pairs, ``details`` the species details DataFrame and ``projections`` the
+    ``(labels, projection)`` pairs of the year-by-year export.
+    """
+    charts = []
+    for i, (heading, fig) in enumerate(figures):
+        job.advance(f"Rendering {heading}")
+        # plotly.js is embedded once, with the first chart.
+        charts.append(f"<h2>{html.escape(heading)}</h2>" + fig.to_html(
+            full_html=False, include_plotlyjs=i == 0, config={"displaylogo": False}
+        ))
+
+    job.advance("Writing species details")
+    page = PAGE.format(
+        title=html.escape(title),
+        subtitle=html.escape(subtitle),
+        metrics=_metric_cards(metrics),
+        charts="\n".join(charts),
+        details=details.to_html(index=False, border=0),
+    )
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+        bundle.writestr("report.html", page)
+        bundle.writestr("species_details.csv", details.to_csv(index=False))
+        bundle.writestr("metrics.json", json.dumps({
+            **metadata,
+            "metrics": [{"label": label, "value": value, "note": note} for label, value, note in metrics],
+        }, indent=2))
+        job.advance("Writing year-by-year data")
+        with bundle.open("year_by_year.csv", "w") as f:
+            export.write_export(f, projections, "csv")
+    job.advance("Done")
+    return buffer.getvalue()
+
+
+def _run(job, args):
+    try:
+        job.payload = build_report(job, *args)
+    except Exception as e:
+        job.error = f"{type(e).__name__}: {e}"
+    else:
+        # A bundle the cache cannot hold (larger than its cap) stays with its job.
+        if shared_cache.put(("report", job.key), job.payload, persist=True):
+            with _lock:
+                _jobs.pop(job.key, None)
+    finally:
+        job._done.set()
+
+
+def get(key):
+    """The job for ``key`` while it runs, after it failed or when the cache could not keep
+    its bundle, a finished job from the cache, or None."""
+    with _lock:
+        job = _jobs.get(key)
+    if job is not None:
+        return job
+    payload = shared_cache.get(("report", key))
+    return None if payload is None else ReportJob.finished(key, payload)
+
+
+def submit(key, title, subtitle, metrics, figures, details, projections, metadata):
+    """Queue a report build for ``key`` (see :func:`build_report`) and return its job.
+
+    A build already running for ``key`` is returned instead of starting another.
+    Raises :class:`ReportQueueFull` when ``MAX_QUEUED`` builds are waiting or running.
+    """
+    with _lock:
+        job = _jobs.get(key)
+        if job is not None and not job.done():
+            return job
+        if sum(not other.done() for other in _jobs.values()) >= MAX_QUEUED:
+            raise ReportQueueFull(f"{MAX_QUEUED} reports are already being generated; try again shortly.")
+        job = _jobs[key] = ReportJob(key, steps=len(figures) + 3)
+    _executor.submit(_run, job, (title, subtitle, metrics, figures, details, list(projections), metadata))
+    return job
@@ -0,0 +1,93 @@
+"""Sensitivity of a plan's projected CO₂ to Survival_Rate, biomass and carbon ratio.
+
+The per-tree curves are proportional to Avg_Biomass_kg_per_year ×
+Carbon_Content_Ratio × Survival_Rate (see growth), and expected survivors to
+Survival_Rate, so under multipliers (s, b, c) a species contributes
+
+    b × c × count × min(s × Survival_Rate, 1)² / Survival_Rate × curve_total
+
+Only the survival term differs by species (through the cap at 100%). It is
+evaluated for every survival multiplier against every species in chunks; the
+biomass and carbon factors are plain products, so any point or line of the
+steps³ grid is read off that one vector without materializing the grid.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+PARAMETERS = ("survival", "biomass", "carbon")
+LABELS = {
+    "survival": "Survival_Rate",
+    "biomass": "Avg_Biomass_kg_per_year",
+    "carbon": "Carbon_Content_Ratio",
+}
+CHUNK_ELEMENTS = 2_000_000
+
+
+@dataclass
+class SweepResult:
+    """A sweep over ``multipliers`` on each axis; ``survival_effect[i]`` is the total at
+    survival multiplier ``i`` with biomass and carbon at their catalog values."""
+
+    multipliers: np.ndarray
+    survival_effect: np.ndarray
+
+    @property
+    def center(self):
+        return int(np.argmin(np.abs(self.multipliers - 1.0)))
+
+    @property
+    def points(self):
+        return len(self.multipliers) ** 3
+
+    @property
+    def baseline(self):
+        return float(self.survival_effect[self.center])
+
+    def total(self, survival, biomass, carbon):
+        """Total CO₂ at the grid indices of the three multipliers."""
+        m = self.multipliers
+        return float(self.survival_effect[survival] * m[biomass] * m[carbon])
+
+    def one_at_a_time(self, parameter):
+        """Totals along one parameter's axis with the other two at their catalog values."""
+        if parameter == "survival":
+            return self.survival_effect.copy()
+        return self.baseline * self.multipliers
+
+    def tornado(self, spread):
+        """``(parameter, low_total, high_total)`` at the grid multipliers nearest 1 ± ``spread``."""
+        low = int(np.argmin(np.abs(self.multipliers - (1.0 - spread))))
+        high = int(np.argmin(np.abs(self.multipliers - (1.0 + spread))))
+        rows = [(name, *self.one_at_a_time(name)[[low, high]].tolist()) for name in PARAMETERS]
+        return sorted(rows, key=lambda row: abs(row[2] - row[1]), reverse=True)
+
+
+def sweep(matrix, plan, spread=0.2, steps=41, horizon=None, chunk_elements=CHUNK_ELEMENTS):
+    """Total CO₂ over a steps×steps×steps grid of multipliers in ``[1 - spread, 1 + spread]``.
+
+    ``steps`` is rounded up to an odd number so the catalog values (multiplier 1)
+    lie on the grid. The grid is returned in separable form (see :class:`SweepResult`).
+    """
+    if not 0 < spread < 1:
+        raise ValueError("spread must be between 0 and 1")
+    steps = int(steps) | 1
+
+    species = list(plan.keys())
+    idx = matrix.indices(species)
+    counts = np.fromiter(plan.values(), dtype=np.float64, count=len(species))
+    survival = matrix.survival[idx]
+    weight = np.divide(counts * matrix.totals_for(horizon, idx), survival,
+                       out=np.zeros(len(species)), where=survival > 0)
+
+    multipliers = np.linspace(1.0 - spread, 1.0 + spread, steps)
+    multipliers[steps // 2] = 1.0
+    survival_effect = np.empty(steps)
+    chunk = max(1, chunk_elements // max(len(species), 1))
+    for start in range(0, steps, chunk):
+        scaled = np.minimum(multipliers[start:start + chunk, None] * survival[None, :], 1.0)
+        survival_effect[start:start + chunk] = (scaled * scaled) @ weight
+
+    return SweepResult(multipliers=multipliers, survival_effect=survival_effect)
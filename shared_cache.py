@@ -0,0 +1,222 @@
+"""Process-wide cache of computed results, shared by every dashboard session.
+
+Entries are keyed by anything with a stable ``repr`` (the dashboard uses plan
+keys, which already hash the catalog version and the normalized plan), kept in
+least-recently-used order and evicted once their estimated size passes a
+memory cap. With a disk directory configured, entries stored with
+``persist=True`` are also pickled there, so a restarted process finds them
+again; the disk tier has its own cap and evicts the oldest files first.
+
+MAX_MB and DISK_DIR come from AFFORESTATION_SHARED_CACHE_MB and
+AFFORESTATION_SHARED_CACHE_DIR (unset or empty: memory only). Only point the
+directory at a location this application alone writes to, since entries are
+unpickled on load. Bump FORMAT when a cached type changes shape or a model
+change alters cached results, so files written by older code are ignored.
+"""
+
+import dataclasses
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+MAX_MB = float(os.environ.get("AFFORESTATION_SHARED_CACHE_MB") or 256)
+DISK_DIR = os.environ.get("AFFORESTATION_SHARED_CACHE_DIR") or None
+DISK_MAX_MB = float(os.environ.get("AFFORESTATION_SHARED_CACHE_DISK_MB") or 1024)
+
+FORMAT = 4
+
+_MISSING = object()
+
+
+def estimate_size(value):
+    """Approximate bytes held by ``value``: exact for bytes, strings and arrays, summed through containers."""
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return sum(estimate_size(getattr(value, field.name)) for field in dataclasses.fields(value))
+    return sys.getsizeof(value)
+
+
+class SharedCache:
+    """Thread-safe LRU cache with a byte budget, hit/miss counters and an optional disk tier."""
+
+    def __init__(self, max_bytes, disk_dir=None, disk_max_bytes=0):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._computing = {}
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, hashlib.sha1(repr((FORMAT, key)).encode()).hexdigest() + ".pkl")
+
+    def _remember(self, key, value, size):
+        """Insert into the memory tier and evict down to the cap; caller holds the lock.
+
+        Returns False, keeping nothing, when ``value`` alone is over the cap.
+        """
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        if size > self.max_bytes:
+            return False
+        self._entries[key] = (value, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+        return True
+
+    def _load(self, key):
+        if not self.disk_dir:
+            return _MISSING
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                stored_key, size, value = pickle.load(f)
+        except FileNotFoundError:
+            return _MISSING
+        except Exception:
+            # Truncated, from an incompatible version, or otherwise unreadable.
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return _MISSING
+        if stored_key != repr((FORMAT, key)):
+            return _MISSING
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self._remember(key, value, size)
+        return value
+
+    def _store(self, key, value, size):
+        tmp = None
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((repr((FORMAT, key)), size, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            if tmp is not None and os.path.exists(tmp):
+                os.remove(tmp)
+            return False
+        self._trim_disk()
+        return True
+
+    def _trim_disk(self):
+        try:
+            files = [entry for entry in os.scandir(self.disk_dir) if entry.name.endswith(".pkl")]
+            stats = sorted(((entry.stat(), entry.path) for entry in files), key=lambda item: item[0].st_mtime)
+        except OSError:
+            return
+        total = sum(stat.st_size for stat, _ in stats)
+        for stat, path in stats:
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= stat.st_size
+
+    def get(self, key, default=None):
+        """The cached value for ``key`` (memory first, then disk), or ``default``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        value = self._load(key)
+        with self._lock:
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.disk_hits += 1
+        return value
+
+    def put(self, key, value, size=None, persist=False):
+        """Cache ``value``; ``size`` defaults to :func:`estimate_size`. ``persist`` also writes it to disk.
+
+        Returns whether either tier kept it: a value over the memory cap is only
+        kept if it was written to disk.
+        """
+        size = estimate_size(value) if size is None else size
+        with self._lock:
+            stored = self._remember(key, value, size)
+        if persist and self.disk_dir:
+            stored = self._store(key, value, size) or stored
+        return stored
+
+    def get_or_compute(self, key, compute, size=None, persist=False):
+        """The cached value for ``key``, computing and caching it on a miss.
+
+        Concurrent callers missing the same key wait for one computation instead
+        of each running ``compute``. ``size`` may be a function of the value.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            pending = self._computing.setdefault(key, threading.Lock())
+        try:
+            with pending:
+                with self._lock:
+                    entry = self._entries.get(key)
+                if entry is not None:
+                    return entry[0]
+                value = compute()
+                self.put(key, value, size(value) if callable(size) else size, persist)
+                return value
+        finally:
+            with self._lock:
+                if self._computing.get(key) is pending:
+                    del self._computing[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+cache = SharedCache(int(MAX_MB * 1024 * 1024), DISK_DIR, int(DISK_MAX_MB * 1024 * 1024))
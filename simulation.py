@@ -0,0 +1,121 @@
+"""Monte Carlo survival uncertainty for planting plans.
+
+Survivor counts are drawn per species as Binomial(trees, Survival_Rate). Every
+reported quantity is linear in those counts, so trials are drawn in chunks and
+folded into fixed-range histograms; memory stays bounded by the chunk size no
+matter how many trials are requested.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+PERCENTILES = (5, 50, 95)
+HISTOGRAM_BINS = 2048
+CHUNK_ELEMENTS = 2_000_000
+SIGMA_RANGE = 8.0
+
+
+@dataclass
+class SurvivalBands:
+    percentiles: tuple
+    trials: int
+    species: list
+    curves: np.ndarray
+    species_survivors: np.ndarray
+    cumulative_total: np.ndarray
+    total_survivors: np.ndarray
+    total_co2: np.ndarray
+
+    @property
+    def annual(self):
+        """Per-species annual CO₂ bands, shaped percentiles×species×years."""
+        return self.species_survivors[:, :, None] * self.curves[None, :, :]
+
+    def band(self, percentile):
+        return self.percentiles.index(percentile)
+
+
+class _StreamingHistogram:
+    def __init__(self, lo, hi, bins):
+        self.lo = lo
+        self.hi = hi
+        self.bins = bins
+        self.width = np.where(hi > lo, (hi - lo) / bins, 1.0)
+        self.counts = np.zeros((len(lo), bins), dtype=np.int64)
+        self._offsets = np.arange(len(lo)) * bins
+
+    def add(self, values):
+        pos = ((values - self.lo) / self.width).astype(np.intp)
+        np.clip(pos, 0, self.bins - 1, out=pos)
+        pos += self._offsets
+        self.counts += np.bincount(pos.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+
+    def quantiles(self, percentiles):
+        cdf = np.cumsum(self.counts, axis=1)
+        total = cdf[:, -1]
+        rows = np.arange(len(self.lo))
+        out = np.empty((len(percentiles), len(self.lo)))
+        for i, q in enumerate(percentiles):
+            target = total * q / 100.0
+            k = (cdf >= target[:, None]).argmax(axis=1)
+            before = np.where(k > 0, cdf[rows, np.maximum(k - 1, 0)], 0)
+            inside = np.maximum(self.counts[rows, k], 1)
+            frac = np.clip((target - before) / inside, 0.0, 1.0)
+            out[i] = np.where(self.hi > self.lo, self.lo + (k + frac) * self.width, self.lo)
+        return out
+
+
+def simulate_survival(matrix, plan, trials=10_000, seed=None, horizon=None, percentiles=PERCENTILES,
+                      bins=HISTOGRAM_BINS, chunk_elements=CHUNK_ELEMENTS):
+    """Percentile bands of survivors and CO₂ for a plan under binomial survival."""
+    species = list(plan.keys())
+    idx = matrix.indices(species)
+    counts = np.fromiter(plan.values(), dtype=np.int64, count=len(species))
+    survival = matrix.survival[idx]
+    curves = matrix.curves_for(horizon, idx)
+    cumulative = matrix.cumulative_for(horizon, idx)
+    n_species, n_years = curves.shape
+
+    # Columns tracked per trial: survivors per species, total cumulative CO₂ per
+    # year, total survivors. Each is a weighted sum of the per-species draws.
+    mean = np.concatenate([
+        counts * survival,
+        (counts * survival) @ cumulative,
+        [np.sum(counts * survival)],
+    ])
+    variance = counts * survival * (1.0 - survival)
+    std = np.sqrt(np.concatenate([
+        variance,
+        variance @ cumulative ** 2,
+        [variance.sum()],
+    ]))
+    upper = np.concatenate([counts, counts @ cumulative, [counts.sum()]]).astype(np.float64)
+    lo = np.clip(mean - SIGMA_RANGE * std, 0.0, upper)
+    hi = np.clip(mean + SIGMA_RANGE * std, 0.0, upper)
+    histogram = _StreamingHistogram(lo, hi, bins)
+
+    rng = np.random.default_rng(seed)
+    chunk = max(1, chunk_elements // (n_species + n_years + 1))
+    for start in range(0, trials, chunk):
+        size = min(chunk, trials - start)
+        survivors = rng.binomial(counts, survival, size=(size, n_species)).astype(np.float64)
+        histogram.add(np.concatenate([
+            survivors,
+            survivors @ cumulative,
+            survivors.sum(axis=1, keepdims=True),
+        ], axis=1))
+
+    q = histogram.quantiles(percentiles)
+    cumulative_total = q[:, n_species:n_species + n_years]
+    return SurvivalBands(
+        percentiles=tuple(percentiles),
+        trials=trials,
+        species=species,
+        curves=curves,
+        species_survivors=q[:, :n_species],
+        cumulative_total=cumulative_total,
+        total_survivors=q[:, -1],
+        total_co2=cumulative_total[:, -1],
+    )
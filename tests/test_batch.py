@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from batch import COLUMNS, read_plans, score_chunk, score_plans
+from catalog import load_catalog
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return load_catalog()
+
+
+def write_plans(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_all_invalid_chunk_gets_error_rows(catalog):
+    rows = score_chunk(catalog, [(1, {"Nope": 5}), (2, {catalog.names[0]: float("nan")})])
+    assert [row[0] for row in rows] == [1, 2]
+    assert all(row[1:5] == (None,) * 4 and row[-1] for row in rows)
+
+
+def test_invalid_lines_do_not_stop_the_run(tmp_path, catalog):
+    name = catalog.names[0]
+    path = write_plans(tmp_path / "plans.jsonl", [
+        json.dumps({name: 10}),
+        json.dumps({name: 3}),
+        json.dumps({"Nope": 5}),
+        "not json",
+        json.dumps({"plan_id": "last", "plan": {name: 1}}),
+    ])
+    rows = [row for chunk in score_plans(read_plans(path), workers=1, chunk_size=2) for row in chunk]
+
+    assert [row[0] for row in rows] == [1, 2, 3, 4, "last"]
+    assert all(len(row) == len(COLUMNS) for row in rows)
+    assert [row[-1] is None for row in rows] == [True, True, False, False, True]
+    assert rows[3][-1].startswith("invalid JSON")
+    assert rows[0][1] == 10 and rows[4][1] == 1
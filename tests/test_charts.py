@@ -0,0 +1,34 @@
+import pytest
+
+import charts
+from catalog import load_catalog
+from projection import project
+
+
+@pytest.fixture(scope="module")
+def projection():
+    catalog = load_catalog()
+    return project(catalog.matrix, {name: 100 for name in catalog.names}, 100)
+
+
+@pytest.mark.parametrize("kind", ["line", "bar", "pie", "cumulative"])
+def test_upper_bound_covers_the_full_figure(projection, kind):
+    fig = charts._build(kind, projection, None, False, False)
+    assert charts.figure_size(fig) <= charts._upper_bound(kind, projection, None, len(projection.species))
+
+
+@pytest.mark.parametrize("kind", ["line", "bar", "pie", "cumulative"])
+def test_no_probes_when_clearly_under_budget(projection, kind, monkeypatch):
+    def probe(*args):
+        raise AssertionError("probed a figure that is far under budget")
+
+    monkeypatch.setattr(charts, "_estimate_size", probe)
+    charts.build_figure(kind, projection, options=charts.RenderOptions(max_series=0))
+
+
+@pytest.mark.parametrize("budget", [20_000, 60_000])
+def test_tight_budget_is_kept(projection, budget):
+    options = charts.RenderOptions(max_series=0, budget_bytes=budget)
+    for kind in ("line", "cumulative"):
+        _, size = charts.build_figure(kind, projection, options=options)
+        assert size <= budget
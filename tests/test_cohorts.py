@@ -0,0 +1,78 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+import cohorts
+from catalog import DEFAULT_CATALOG, load_catalog
+from cohorts import convolve_cohorts, project_schedule, repeat_schedule
+from projection import SpeciesMatrix, project
+from registers import read_register
+
+
+@pytest.fixture(scope="module")
+def matrix():
+    return load_catalog().matrix
+
+
+@pytest.fixture(scope="module")
+def curve_matrix():
+    """The shipped catalog with an explicit Survival_Curve for its first species."""
+    with open(DEFAULT_CATALOG, encoding="utf-8") as f:
+        tree_data = json.load(f)["species"]
+    next(iter(tree_data.values()))["Survival_Curve"] = [0.9, 0.8, 0.7, 0.6]
+    return SpeciesMatrix.from_tree_data(tree_data)
+
+
+@pytest.mark.parametrize("horizon", [20, 45])
+def test_single_round_matches_project(matrix, horizon):
+    plan = {name: 100 + 10 * i for i, name in enumerate(matrix.names[:8])}
+    expected = project(matrix, plan, horizon)
+    actual = project_schedule(matrix, repeat_schedule(plan, 1), horizon)
+
+    np.testing.assert_allclose(actual.survivors, expected.survivors, rtol=1e-12)
+    np.testing.assert_allclose(actual.annual, expected.annual, rtol=1e-12)
+    np.testing.assert_allclose(actual.totals, expected.totals, rtol=1e-12)
+
+
+def test_single_year_register_matches_project(matrix):
+    plan = {name: 100 for name in matrix.names[:3]}
+    csv = "species,count,planting_year,site\n" + "".join(
+        f"{name},{count // 2},2020,{site}\n" for name, count in plan.items() for site in ("a", "b")
+    )
+    register = read_register(io.StringIO(csv), matrix.names)
+    expected = project(matrix, plan)
+
+    assert project_schedule(matrix, register.schedule()).total_co2 == pytest.approx(expected.total_co2, rel=1e-12)
+    sites = register.site_totals(matrix)
+    assert sites["Expected Survivors"].sum() == pytest.approx(expected.total_survivors, rel=1e-12)
+    assert sites.iloc[:, -1].sum() == pytest.approx(expected.total_co2, rel=1e-12)
+
+
+def test_explicit_survival_curve(matrix, curve_matrix):
+    alive = curve_matrix.survival_curves_for(6)
+    np.testing.assert_allclose(alive[0], [0.9, 0.8, 0.7, 0.6, 0.6, 0.6])
+    np.testing.assert_allclose(alive[1:], matrix.survival_curves_for(6)[1:])
+
+
+def test_cohorts_add_up(matrix):
+    plan = {name: 50 for name in matrix.names[:5]}
+    once = project_schedule(matrix, repeat_schedule(plan, 1), 30)
+    twice = project_schedule(matrix, repeat_schedule(plan, 2, every=10), 30)
+    later = project_schedule(matrix, {name: [0] * 10 + [50] for name in plan}, 30)
+
+    np.testing.assert_allclose(twice.annual, once.annual + later.annual, rtol=1e-12)
+    np.testing.assert_allclose(twice.survivors, once.survivors + later.survivors, rtol=1e-12)
+
+
+def test_fft_matches_direct_convolution(monkeypatch):
+    rng = np.random.default_rng(0)
+    planted = rng.integers(0, 1000, size=(50, 100)).astype(np.float64)
+    weights = rng.random((50, 100)) * 500
+
+    fft = convolve_cohorts(planted, weights)
+    monkeypatch.setattr(cohorts, "FFT_MIN_COHORTS", planted.shape[1] + 1)
+    direct = convolve_cohorts(planted, weights)
+
+    assert np.abs(fft - direct).max() <= 2e-9 * np.abs(direct).max()
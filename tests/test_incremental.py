@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from catalog import load_catalog
+from projection import IncrementalProjection, project
+
+
+@pytest.fixture(scope="module")
+def matrix():
+    return load_catalog().matrix
+
+
+def random_plans(matrix, steps, seed=0):
+    """A walk of plans, each adding, changing or dropping one species."""
+    rng = np.random.default_rng(seed)
+    plan = {}
+    for _ in range(steps):
+        name = matrix.names[rng.integers(len(matrix))]
+        if name in plan and rng.random() < 0.3:
+            del plan[name]
+        else:
+            plan[name] = int(rng.integers(1, 10_000))
+        yield dict(plan)
+
+
+def assert_matches_project(aggregate, matrix, plan, horizon, rtol):
+    expected = project(matrix, plan, horizon)
+    assert aggregate.total_trees == expected.total_trees
+    assert aggregate.total_survivors == pytest.approx(expected.total_survivors, rel=rtol)
+    assert aggregate.total_co2 == pytest.approx(expected.total_co2, rel=rtol)
+    np.testing.assert_allclose(aggregate.cumulative_total, expected.cumulative_total, rtol=rtol)
+
+    order = np.argsort(matrix.indices(expected.species))
+    actual = aggregate.projection()
+    assert actual.species == [expected.species[i] for i in order]
+    np.testing.assert_allclose(actual.cumulative, expected.cumulative[order], rtol=1e-12)
+
+
+@pytest.mark.parametrize("horizon", [20, 60])
+def test_updates_match_project(matrix, horizon):
+    aggregate = IncrementalProjection(matrix, horizon)
+    for plan in random_plans(matrix, 300):
+        aggregate.update(plan)
+        if plan:
+            assert_matches_project(aggregate, matrix, plan, horizon, rtol=1e-9)
+
+
+def test_rebase_matches_project(matrix):
+    aggregate = IncrementalProjection(matrix, 40)
+    aggregate.REBASE_EVERY = 7
+    for step, plan in enumerate(random_plans(matrix, 70, seed=1), start=1):
+        aggregate.update(plan)
+        if step % aggregate.REBASE_EVERY == 0 and plan:
+            assert_matches_project(aggregate, matrix, plan, 40, rtol=1e-12)
+
+
+def test_unchanged_plan_is_a_no_op(matrix):
+    aggregate = IncrementalProjection(matrix)
+    plan = {matrix.names[0]: 10, matrix.names[1]: 20}
+    assert len(aggregate.update(plan)) == 2
+    assert len(aggregate.update(dict(plan))) == 0
+    assert aggregate.updates == 1
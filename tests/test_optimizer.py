@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from catalog import load_catalog
+from optimizer import _greedy, optimize_mix, pareto_frontier, tree_values
+
+
+@pytest.fixture(scope="module")
+def matrix():
+    return load_catalog().matrix
+
+
+@pytest.fixture(scope="module")
+def costs(matrix):
+    return np.random.default_rng(0).uniform(5, 200, len(matrix)).round(2)
+
+
+def assert_feasible(mix, tree_budget, lo, hi, costs=None, cost_budget=None):
+    assert mix.trees <= tree_budget
+    assert mix.trees == mix.counts.sum()
+    assert np.all(mix.counts >= lo) and np.all(mix.counts <= hi)
+    if cost_budget is not None:
+        assert mix.counts @ costs <= cost_budget + 1e-6
+        assert mix.cost == pytest.approx(mix.counts @ costs)
+
+
+def dual_bound(matrix, tree_budget, lo, hi, costs, cost_budget, horizon=None):
+    """Smallest Lagrangian upper bound on the CO₂ of any mix within both budgets."""
+    value = tree_values(matrix, horizon)
+    remaining = tree_budget - lo.sum()
+    best = np.inf
+    for multiplier in np.linspace(0, (value / costs).max(), 4001):
+        score = value - multiplier * costs
+        counts = _greedy(score, lo, hi, remaining)
+        best = min(best, multiplier * cost_budget + counts @ score)
+    return best
+
+
+def test_tree_budget_only(matrix):
+    lo, hi = np.zeros(len(matrix)), np.full(len(matrix), 300)
+    mix = optimize_mix(matrix, 1000, min_counts=lo, max_counts=hi)
+    assert_feasible(mix, 1000, lo, hi)
+    assert mix.trees == 1000
+
+    value = tree_values(matrix)
+    best = np.sort(value)[::-1]
+    assert mix.co2 == pytest.approx(300 * best[:3].sum() + 100 * best[3])
+
+
+@pytest.mark.parametrize("cost_budget", [20_000.0, 150_000.0, 1_000_000.0])
+def test_cost_budget(matrix, costs, cost_budget):
+    lo = np.where(np.arange(len(matrix)) < 3, 20, 0)
+    hi = np.full(len(matrix), 2000)
+    mix = optimize_mix(matrix, 10_000, min_counts=lo, max_counts=hi, cost_per_tree=costs,
+                       cost_budget=cost_budget)
+    assert_feasible(mix, 10_000, lo, hi, costs, cost_budget)
+    assert mix.co2 >= 0.999 * dual_bound(matrix, 10_000, lo, hi, costs, cost_budget)
+
+
+def test_infeasible_minimums(matrix, costs):
+    with pytest.raises(ValueError):
+        optimize_mix(matrix, 10, min_counts=1)
+    with pytest.raises(ValueError):
+        optimize_mix(matrix, 1000, min_counts=10, cost_per_tree=costs, cost_budget=100.0)
+
+
+def test_pareto_frontier(matrix, costs):
+    lo = np.where(np.arange(len(matrix)) < 3, 20, 0)
+    hi = np.full(len(matrix), 2000)
+    front = pareto_frontier(matrix, 10_000, costs, min_counts=lo, max_counts=hi)
+    assert 1 < len(front.mixes) <= 25
+    assert np.all(np.diff(front.costs) > 0) and np.all(np.diff(front.co2) > 0)
+    assert front.costs[0] == pytest.approx(lo @ costs)
+    assert front.co2[-1] == pytest.approx(optimize_mix(matrix, 10_000, lo, hi).co2)
+
+    for mix in front.mixes[1::6]:
+        assert_feasible(mix, 10_000, lo, hi, costs, mix.cost)
+        solved = optimize_mix(matrix, 10_000, lo, hi, costs, mix.cost)
+        assert solved.co2 <= mix.co2 * (1 + 1e-9)
+        assert solved.co2 >= 0.999 * mix.co2
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from catalog import load_catalog
+from projection import project
+from regions import RegionSet, project_regions
+from sensitivity import PARAMETERS, sweep
+
+
+@pytest.fixture(scope="module")
+def matrix():
+    return load_catalog().matrix
+
+
+@pytest.fixture(scope="module")
+def plan(matrix):
+    return {name: 100 + i for i, name in enumerate(matrix.names)}
+
+
+def test_baseline_matches_project(matrix, plan):
+    result = sweep(matrix, plan, 0.5, 21, horizon=30)
+    assert result.baseline == pytest.approx(project(matrix, plan, 30).total_co2, rel=1e-12)
+    for name in PARAMETERS:
+        assert result.one_at_a_time(name)[result.center] == pytest.approx(result.baseline, rel=1e-12)
+
+
+def test_grid_points_match_regions(matrix, plan):
+    """A region scaling survival and growth is the same model as one grid point."""
+    result = sweep(matrix, plan, 0.5, 11, chunk_elements=50)
+    points = [(0, 3, 10), (10, 0, 5), (7, 7, 2), (result.center,) * 3]
+    m = result.multipliers
+    regions = RegionSet("test", "1", {
+        str(point): {"survival_multiplier": m[point[0]], "growth_multiplier": m[point[1]] * m[point[2]]}
+        for point in points
+    })
+    expected = project_regions(matrix, plan, regions).total_co2
+    np.testing.assert_allclose([result.total(*point) for point in points], expected, rtol=1e-12)
+
+
+def test_tornado_reads_one_at_a_time_lines(matrix, plan):
+    result = sweep(matrix, plan, 0.4, 9)
+    rows = {name: (low, high) for name, low, high in result.tornado(0.4)}
+    for name in PARAMETERS:
+        line = result.one_at_a_time(name)
+        assert rows[name] == (line[0], line[-1])
+    assert rows["biomass"] == pytest.approx((0.6 * result.baseline, 1.4 * result.baseline))
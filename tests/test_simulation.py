@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from catalog import load_catalog
+from simulation import PERCENTILES, simulate_survival
+
+
+@pytest.fixture(scope="module")
+def matrix():
+    return load_catalog().matrix
+
+
+def exact_draws(matrix, plan, trials, seed, horizon=None):
+    """The survivor draws simulate_survival makes when everything fits in one chunk."""
+    idx = matrix.indices(list(plan))
+    counts = np.fromiter(plan.values(), dtype=np.int64, count=len(plan))
+    rng = np.random.default_rng(seed)
+    survivors = rng.binomial(counts, matrix.survival[idx], size=(trials, len(plan))).astype(np.float64)
+    return survivors, survivors @ matrix.cumulative_for(horizon, idx)
+
+
+@pytest.mark.parametrize("trees", [50, 10_000])
+def test_histogram_quantiles_match_exact_percentiles(matrix, trees):
+    plan = {name: trees for name in matrix.names[:6]}
+    bands = simulate_survival(matrix, plan, trials=20_000, seed=3, chunk_elements=10**9)
+    survivors, cumulative = exact_draws(matrix, plan, 20_000, seed=3)
+
+    expected_co2 = np.percentile(cumulative[:, -1], PERCENTILES)
+    expected_survivors = np.percentile(survivors.sum(axis=1), PERCENTILES)
+    np.testing.assert_allclose(bands.total_co2, expected_co2, rtol=1e-4)
+    # Survivor counts are whole trees; the histogram interpolates within a bin.
+    np.testing.assert_allclose(bands.total_survivors, expected_survivors, rtol=1e-4, atol=0.5)
+
+
+def test_chunking_does_not_change_bands(matrix):
+    plan = {name: 500 for name in matrix.names[:4]}
+    whole = simulate_survival(matrix, plan, trials=5_000, seed=7, chunk_elements=10**9)
+    chunked = simulate_survival(matrix, plan, trials=5_000, seed=7, chunk_elements=1_000)
+
+    assert np.all(np.diff(chunked.total_co2) >= 0)
+    np.testing.assert_allclose(chunked.total_co2, whole.total_co2, rtol=1e-3)
@@ -0,0 +1,30 @@
+import threading
+
+import timing
+
+
+def test_concurrent_writes_leave_a_whole_file(tmp_path, monkeypatch):
+    path = tmp_path / "timings.prom"
+    for i in range(50):
+        timing.stats.add(f"stage_{i}", 0.01 * i, size=i)
+    expected = timing.stats.prometheus_text()
+
+    threads = [threading.Thread(target=timing.write_metrics, args=(str(path),)) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert path.read_text(encoding="utf-8") == expected
+    assert [p.name for p in tmp_path.iterdir()] == ["timings.prom"]
+
+
+def test_writes_are_throttled(tmp_path, monkeypatch):
+    path = tmp_path / "timings.prom"
+    monkeypatch.setattr(timing, "_metrics_written", -timing.METRICS_INTERVAL)
+    timing.write_metrics(str(path), min_interval=timing.METRICS_INTERVAL)
+    assert path.exists()
+
+    path.unlink()
+    timing.write_metrics(str(path), min_interval=timing.METRICS_INTERVAL)
+    assert not path.exists()
@@ -0,0 +1,176 @@
+"""Wall-clock timings of the dashboard's stages on every rerun.
+
+Each completed stage is appended as one JSON line to a rotating log and folded
+into process-wide rolling windows, whose p50/p95 are written as a Prometheus
+text file for a node_exporter textfile collector (or any scraper reading it).
+Paths come from AFFORESTATION_TIMING_LOG and AFFORESTATION_METRICS_FILE; set
+either to an empty string to turn it off.
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+LOG_PATH = os.environ.get("AFFORESTATION_TIMING_LOG", os.path.join(LOG_DIR, "timings.jsonl"))
+METRICS_PATH = os.environ.get("AFFORESTATION_METRICS_FILE", os.path.join(LOG_DIR, "timings.prom"))
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+WINDOW = 1000
+METRICS_INTERVAL = 5.0
+QUANTILES = (0.5, 0.95)
+
+
+class StageStats:
+    """Rolling per-stage wall times (last ``window`` samples) and lifetime totals."""
+
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self._samples = {}
+        self._count = {}
+        self._sum = {}
+        self._bytes = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds, size=None):
+        with self._lock:
+            self._samples.setdefault(stage, deque(maxlen=self.window)).append(seconds)
+            self._count[stage] = self._count.get(stage, 0) + 1
+            self._sum[stage] = self._sum.get(stage, 0.0) + seconds
+            if size is not None:
+                self._bytes[stage] = size
+
+    def summary(self):
+        """``{stage: {"count", "p50_ms", "p95_ms", "bytes"}}`` over the current window."""
+        with self._lock:
+            samples = {stage: np.array(values) for stage, values in self._samples.items()}
+            counts = dict(self._count)
+            sizes = dict(self._bytes)
+        out = {}
+        for stage, values in sorted(samples.items()):
+            p50, p95 = np.quantile(values, QUANTILES) * 1000.0
+            out[stage] = {"count": counts[stage], "p50_ms": p50, "p95_ms": p95, "bytes": sizes.get(stage)}
+        return out
+
+    def prometheus_text(self):
+        with self._lock:
+            samples = {stage: np.array(values) for stage, values in self._samples.items()}
+            counts = dict(self._count)
+            sums = dict(self._sum)
+            sizes = dict(self._bytes)
+
+        lines = [
+            "# HELP afforestation_stage_seconds Wall time of dashboard stages per rerun.",
+            "# TYPE afforestation_stage_seconds summary",
+        ]
+        for stage, values in sorted(samples.items()):
+            for q, value in zip(QUANTILES, np.quantile(values, QUANTILES)):
+                lines.append(f'afforestation_stage_seconds{{stage="{stage}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'afforestation_stage_seconds_sum{{stage="{stage}"}} {sums[stage]:.6f}')
+            lines.append(f'afforestation_stage_seconds_count{{stage="{stage}"}} {counts[stage]}')
+        if sizes:
+            lines += [
+                "# HELP afforestation_figure_bytes Serialized size of the last figure built per stage.",
+                "# TYPE afforestation_figure_bytes gauge",
+            ]
+            lines += [f'afforestation_figure_bytes{{stage="{stage}"}} {size}' for stage, size in sorted(sizes.items())]
+        return "\n".join(lines) + "\n"
+
+
+stats = StageStats()
+
+_logger = None
+_logger_lock = threading.Lock()
+_metrics_lock = threading.Lock()
+_metrics_written = -METRICS_INTERVAL
+
+
+def _timing_logger():
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            _logger = logging.getLogger("afforestation.timings")
+            _logger.propagate = False
+            if LOG_PATH and not _logger.handlers:
+                try:
+                    os.makedirs(os.path.dirname(os.path.abspath(LOG_PATH)), exist_ok=True)
+                    handler = logging.handlers.RotatingFileHandler(
+                        LOG_PATH, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8"
+                    )
+                except OSError:
+                    handler = logging.NullHandler()
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                _logger.addHandler(handler)
+                _logger.setLevel(logging.INFO)
+        return _logger
+
+
+def write_metrics(path=METRICS_PATH, min_interval=0.0):
+    """Rewrite the Prometheus text file atomically so a scraper never sees half of it.
+
+    Sessions share the process, so writers are serialized; a call within
+    ``min_interval`` seconds of the last write does nothing.
+    """
+    global _metrics_written
+    with _metrics_lock:
+        now = time.monotonic()
+        if now - _metrics_written < min_interval:
+            return
+        _metrics_written = now
+        if not path:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(stats.prometheus_text())
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+
+class RerunTimer:
+    """Stage timings of one rerun, tagged with the size of the current selection."""
+
+    def __init__(self):
+        self.rerun_id = uuid.uuid4().hex[:12]
+        self.started = time.time()
+        self.selection = {}
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        """Time the block; the yielded dict takes extra fields such as ``bytes``."""
+        record = {"stage": name}
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["ms"] = round((time.perf_counter() - start) * 1000.0, 3)
+            self.stages.append(record)
+            self._observe(record)
+
+    def _observe(self, record):
+        stats.add(record["stage"], record["ms"] / 1000.0, record.get("bytes"))
+        _timing_logger().info(json.dumps({
+            "ts": round(time.time(), 3),
+            "rerun": self.rerun_id,
+            **self.selection,
+            **record,
+        }))
+        write_metrics(min_interval=METRICS_INTERVAL)
+
+    def finish(self):
+        """Record the whole rerun as the ``total`` stage."""
+        record = {"stage": "total", "ms": round((time.time() - self.started) * 1000.0, 3)}
+        self.stages.append(record)
+        self._observe(record)